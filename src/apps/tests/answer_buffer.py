@@ -0,0 +1,242 @@
+"""Отложенная запись ответов пользователей (write-behind).
+
+Принятый ответ дописывается строкой JSON в журнал попытки
+<ANSWER_BUFFER_DIR>/<test_id>-<user_id>.log и сбрасывается на диск до ответа
+клиенту. В БД ответы переносятся пачками командой flush_answers, а также
+перед end-test и user-test этой попытки. Перенос идемпотентен: ответы, которые
+уже есть в БД, пропускаются, поэтому журналы, оставшиеся после сбоя, можно
+просто перенести повторно. При GRADING_MODE=deferred последний ответ на
+вопрос заменяет сохранённый.
+
+Запись в журнал и перенос берут исключительную блокировку файла; перенос
+удаляет журнал после фиксации транзакции.
+"""
+
+import fcntl
+import json
+import logging
+import os
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+
+from apps.tests import grading
+from apps.tests.answer_keys import answer_keys
+from apps.tests.models import TestResult
+from apps.users.models import UserAnswer
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerBuffer:
+    def __init__(self, directory: str | Path, fsync: bool = True) -> None:
+        self.directory = Path(directory)
+        self.fsync = fsync
+
+    def get_path(self, user_id: int, test_id: int) -> Path:
+        return self.directory / f'{test_id}-{user_id}.log'
+
+    def append(
+        self,
+        user_id: int,
+        test_id: int,
+        question_id: int,
+        numbers: list[int],
+        unique: bool = False,
+    ) -> bool:
+        """Дописывает ответ в журнал попытки.
+
+        При unique=True ответ не записывается и возвращается False, если в
+        журнале уже есть ответ на этот вопрос. Проверка и запись выполняются
+        под одной блокировкой журнала.
+        """
+        entry = {
+            'user_id': user_id,
+            'test_id': test_id,
+            'question_id': question_id,
+            'numbers': numbers,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._open_for_append(self.get_path(user_id, test_id)) as fd:
+            content = read_all(fd)
+            # Незавершённая последняя строка остаётся после сбоя во время
+            # записи; она отрезается, чтобы следующая запись не склеилась с ней.
+            size = content.rfind(b'\n') + 1
+            if size != len(content):
+                os.ftruncate(fd, size)
+            if unique and any(
+                entry['question_id'] == question_id for entry in parse(content[:size])
+            ):
+                return False
+            os.write(fd, json.dumps(entry).encode() + b'\n')
+            if self.fsync:
+                os.fsync(fd)
+        return True
+
+    def flush_attempt(self, user_id: int | str | None, test_id: int | str) -> int:
+        """Переносит ответы попытки в БД; вызывается вне транзакции."""
+        try:
+            path = self.get_path(int(user_id), int(test_id))
+        except (TypeError, ValueError):
+            return 0
+        if not path.exists():
+            return 0
+        return self._flush([path])
+
+    def flush(self, batch_size: int) -> int:
+        """Переносит все журналы, по batch_size журналов в транзакции."""
+        if not self.directory.exists():
+            return 0
+        paths = iter(sorted(self.directory.glob('*.log')))
+        saved = 0
+        while batch := list(islice(paths, batch_size)):
+            saved += self._flush(batch)
+        return saved
+
+    def _flush(self, paths: list[Path]) -> int:
+        with ExitStack() as stack:
+            locked_paths = []
+            entries = []
+            for path in paths:
+                fd = stack.enter_context(self._open_for_flush(path))
+                if fd is None:
+                    continue
+                locked_paths.append(path)
+                entries.extend(parse(read_all(fd)))
+
+            with transaction.atomic():
+                saved = save_entries(entries)
+            # Журналы удаляются под блокировкой, поэтому ожидающие записи
+            # откроют новый файл.
+            for path in locked_paths:
+                path.unlink()
+        return saved
+
+    @staticmethod
+    @contextmanager
+    def _open_for_append(path: Path) -> Iterator[int]:
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # Журнал мог быть перенесён и удалён, пока мы ждали блокировку.
+            if os.fstat(fd).st_nlink:
+                break
+            os.close(fd)
+        try:
+            yield fd
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    @contextmanager
+    def _open_for_flush(path: Path) -> Iterator[int | None]:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            yield None
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield fd if os.fstat(fd).st_nlink else None
+        finally:
+            os.close(fd)
+
+
+def read_all(fd: int) -> bytes:
+    with os.fdopen(os.dup(fd), 'rb') as file:
+        file.seek(0)
+        return file.read()
+
+
+def parse(content: bytes) -> Iterator[dict]:
+    # Незавершённая последняя строка остаётся после сбоя во время записи;
+    # такой ответ не был подтверждён клиенту.
+    for line in content.split(b'\n')[:-1]:
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # Повреждённая строка не должна останавливать перенос остальных.
+            logger.warning('Пропущена повреждённая строка журнала ответов: %r', line)
+
+
+def save_entries(entries: list[dict]) -> int:
+    """Сохраняет ответы из журналов, пропуская уже сохранённые."""
+    if grading.is_deferred():
+        return upsert_entries(entries)
+
+    # Из повторных ответов на вопрос действует первый, как и при записи в БД.
+    entries = {
+        (entry['user_id'], entry['question_id']): entry for entry in reversed(entries)
+    }
+    if not entries:
+        return 0
+    existing = set(
+        UserAnswer.objects.filter(
+            user_id__in={user_id for user_id, _ in entries},
+            question_id__in={question_id for _, question_id in entries},
+        ).values_list('user_id', 'question_id')
+    )
+    keys = answer_keys.get_many(question_id for _, question_id in entries)
+    # Ответы на удалённые вопросы отбрасываются.
+    new_entries = [
+        entry
+        for key, entry in entries.items()
+        if key not in existing and entry['question_id'] in keys
+    ]
+    UserAnswer.objects.bulk_create(
+        UserAnswer(
+            user_id=entry['user_id'],
+            question_id=entry['question_id'],
+            selected_numbers=entry['numbers'],
+        )
+        for entry in new_entries
+    )
+
+    results = Counter()
+    for entry in new_entries:
+        results[entry['user_id'], entry['test_id']] += keys[
+            entry['question_id']
+        ].is_correct(entry['numbers'])
+    results = {attempt: correct for attempt, correct in results.items() if correct}
+    if results:
+        attempts = [Q(user_id=user_id, test_id=test_id) for user_id, test_id in results]
+        TestResult.objects.filter(Q(*attempts, _connector=Q.OR)).update(
+            results=F('results')
+            + Case(
+                *(
+                    When(attempt, then=Value(correct))
+                    for attempt, correct in zip(attempts, results.values())
+                ),
+                default=Value(0),
+            )
+        )
+    return len(new_entries)
+
+
+def upsert_entries(entries: list[dict]) -> int:
+    """Сохраняет ответы из журналов; последний ответ на вопрос заменяет прежние."""
+    entries = {(entry['user_id'], entry['question_id']): entry for entry in entries}
+    keys = answer_keys.get_many(question_id for _, question_id in entries)
+    user_answers = UserAnswer.objects.upsert(
+        [
+            UserAnswer(
+                user_id=entry['user_id'],
+                question_id=entry['question_id'],
+                selected_numbers=entry['numbers'],
+            )
+            for entry in entries.values()
+            if entry['question_id'] in keys
+        ]
+    )
+    return len(user_answers)
+
+
+answer_buffer = AnswerBuffer(
+    settings.ANSWER_BUFFER_DIR, fsync=settings.ANSWER_BUFFER_FSYNC
+)
@@ -0,0 +1,157 @@
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from threading import Lock
+
+from django.conf import settings
+from django.db.models import QuerySet
+
+from apps.tests.models import Question
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    """Скомпилированный ключ ответов на вопрос."""
+
+    test_id: int
+    valid_numbers: frozenset[int]
+    correct_numbers: frozenset[int]
+    option_ids: dict[int, int]
+
+    def is_valid(self, numbers: Iterable[int]) -> bool:
+        return set(numbers).issubset(self.valid_numbers)
+
+    def is_correct(self, numbers: Iterable[int]) -> bool:
+        return set(numbers).issubset(self.correct_numbers)
+
+    def get_option_ids(self, numbers: Iterable[int]) -> list[int]:
+        return [self.option_ids[number] for number in self.get_numbers(numbers)]
+
+    @staticmethod
+    def get_numbers(numbers: Iterable[int]) -> list[int]:
+        """Номера ответов в том виде, в котором они хранятся в UserAnswer."""
+        return sorted(set(numbers))
+
+
+class AnswerKeyCache:
+    """LRU-кэш ключей ответов в памяти процесса.
+
+    Запись хранит версию теста, с которой ключ был загружен. Изменение
+    вопросов и вариантов ответов увеличивает Test.version, поэтому при каждом
+    обращении версии найденных записей сверяются с БД одним запросом по
+    первичному ключу и устаревшие записи загружаются заново. Так изменения
+    видны всем процессам без общего кэша.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, tuple[int, AnswerKey]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, question_id: int) -> AnswerKey | None:
+        return self.get_many([question_id]).get(question_id)
+
+    async def aget(self, question_id: int) -> AnswerKey | None:
+        return (await self.aget_many([question_id])).get(question_id)
+
+    def get_many(self, question_ids: Iterable[int]) -> dict[int, AnswerKey]:
+        """Ключи ответов по вопросам; недостающие загружаются одним запросом."""
+        question_ids = set(question_ids)
+        entries = self._lookup(question_ids)
+        if entries:
+            entries = self._fresh(entries, self._versions(entries))
+
+        missing_ids = question_ids - entries.keys()
+        if missing_ids:
+            loaded = self._build(self._rows(missing_ids))
+            entries.update(loaded)
+            self._store(loaded)
+        return {question_id: entry[1] for question_id, entry in entries.items()}
+
+    async def aget_many(self, question_ids: Iterable[int]) -> dict[int, AnswerKey]:
+        question_ids = set(question_ids)
+        entries = self._lookup(question_ids)
+        if entries:
+            versions = [row async for row in self._versions(entries)]
+            entries = self._fresh(entries, versions)
+
+        missing_ids = question_ids - entries.keys()
+        if missing_ids:
+            loaded = self._build([row async for row in self._rows(missing_ids)])
+            entries.update(loaded)
+            self._store(loaded)
+        return {question_id: entry[1] for question_id, entry in entries.items()}
+
+    def _lookup(self, question_ids: set[int]) -> dict[int, tuple[int, AnswerKey]]:
+        entries = {}
+        with self._lock:
+            for question_id in question_ids:
+                entry = self._entries.get(question_id)
+                if entry is not None:
+                    self._entries.move_to_end(question_id)
+                    entries[question_id] = entry
+        return entries
+
+    @staticmethod
+    def _versions(entries: dict[int, tuple[int, AnswerKey]]) -> QuerySet:
+        return Question.objects.filter(pk__in=entries).values_list(
+            'id', 'test_id', 'test__version'
+        )
+
+    @staticmethod
+    def _fresh(
+        entries: dict[int, tuple[int, AnswerKey]], versions: Iterable[tuple]
+    ) -> dict[int, tuple[int, AnswerKey]]:
+        """Записи, у которых вопрос по-прежнему в том же тесте той же версии."""
+        return {
+            question_id: entries[question_id]
+            for question_id, test_id, version in versions
+            if entries[question_id][0] == version
+            and entries[question_id][1].test_id == test_id
+        }
+
+    def _store(self, entries: dict[int, tuple[int, AnswerKey]]) -> None:
+        with self._lock:
+            self._entries.update(entries)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _rows(question_ids: Iterable[int]) -> QuerySet:
+        return Question.objects.filter(pk__in=question_ids).values_list(
+            'id',
+            'test_id',
+            'test__version',
+            'answer_options__id',
+            'answer_options__number',
+            'answer_options__is_correct',
+        )
+
+    @staticmethod
+    def _build(rows: Iterable[tuple]) -> dict[int, tuple[int, AnswerKey]]:
+        tests = {}
+        options = defaultdict(dict)
+        correct = defaultdict(set)
+        for question_id, test_id, version, answer_option_id, number, is_correct in rows:
+            tests[question_id] = test_id, version
+            if answer_option_id is None:
+                continue
+            options[question_id][number] = answer_option_id
+            if is_correct:
+                correct[question_id].add(number)
+
+        return {
+            question_id: (
+                version,
+                AnswerKey(
+                    test_id=test_id,
+                    valid_numbers=frozenset(options[question_id]),
+                    correct_numbers=frozenset(correct[question_id]),
+                    option_ids=options[question_id],
+                ),
+            )
+            for question_id, (test_id, version) in tests.items()
+        }
+
+
+answer_keys = AnswerKeyCache(maxsize=settings.ANSWER_KEY_CACHE_SIZE)
@@ -0,0 +1,174 @@
+"""Сохранение ответа save-answer одним SQL-запросом.
+
+Ключ ответов на вопрос берётся из кэша answer_keys, поэтому номера ответов
+проверяются и оцениваются в памяти. Запрос проверяет пользователя, вопрос и
+начатую попытку, добавляет ответ и увеличивает результат попытки. Ошибки
+возвращаются с теми же сообщениями и в том же порядке, что у
+SaveAnswerTestSerializer.
+"""
+
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator
+
+from apps.tests import grading
+from apps.tests.answer_keys import AnswerKey, answer_keys
+from apps.tests.models import Question, TestResult
+from apps.tests.request_data import does_not_exist, get_numbers, get_pk
+from apps.users.models import User, UserAnswer
+
+SAVE_ANSWER_SQL = """
+WITH attempt AS (
+    SELECT id
+    FROM {test_result_table}
+    WHERE user_id = %(user_id)s AND test_id = %(test_id)s
+),
+answer AS (
+    INSERT INTO {user_answer_table} (user_id, question_id, selected_numbers)
+    SELECT %(user_id)s, %(question_id)s, %(numbers)s::integer[]
+    FROM attempt
+    WHERE %(valid)s AND EXISTS (SELECT FROM {question_table} WHERE id = %(question_id)s)
+    ON CONFLICT (user_id, question_id) DO {on_conflict}
+    RETURNING id
+),
+result AS (
+    UPDATE {test_result_table}
+    SET results = results + 1
+    WHERE id IN (SELECT id FROM attempt) AND %(correct)s AND EXISTS (SELECT FROM answer)
+)
+SELECT
+    (SELECT id FROM answer),
+    EXISTS (SELECT FROM {user_table} WHERE id = %(user_id)s),
+    EXISTS (SELECT FROM {question_table} WHERE id = %(question_id)s),
+    EXISTS (SELECT FROM attempt),
+    EXISTS (
+        SELECT FROM {user_answer_table}
+        WHERE user_id = %(user_id)s AND question_id = %(question_id)s
+    )
+"""
+
+# При отложенном подсчёте баллов повторный ответ заменяет предыдущий.
+ON_CONFLICT = {
+    'immediate': 'NOTHING',
+    'deferred': 'UPDATE SET selected_numbers = EXCLUDED.selected_numbers',
+}
+
+
+def save_answer(data: dict[str, Any]) -> dict[str, Any]:
+    """Сохраняет ответ из данных запроса save-answer."""
+    errors = {}
+    user_id = get_pk(data, 'user_id', errors)
+    question_id = get_pk(data, 'question_id', errors)
+    numbers = get_numbers(data, errors)
+    answer_key = answer_keys.get(question_id) if question_id is not None else None
+    params = get_params(user_id, question_id, numbers, answer_key)
+    with connection.cursor() as cursor:
+        cursor.execute(get_sql(), params)
+        row = cursor.fetchone()
+    return get_response(data, params, numbers, errors, answer_key, row)
+
+
+async def asave_answer(data: dict[str, Any]) -> dict[str, Any]:
+    errors = {}
+    user_id = get_pk(data, 'user_id', errors)
+    question_id = get_pk(data, 'question_id', errors)
+    numbers = get_numbers(data, errors)
+    answer_key = (
+        await answer_keys.aget(question_id) if question_id is not None else None
+    )
+    params = get_params(user_id, question_id, numbers, answer_key)
+    row = await sync_to_async(_execute)(get_sql(), params)
+    return get_response(data, params, numbers, errors, answer_key, row)
+
+
+def _execute(sql: str, params: dict[str, Any]) -> tuple:
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()
+
+
+def get_sql() -> str:
+    mode = 'deferred' if grading.is_deferred() else 'immediate'
+    return SAVE_ANSWER_SQL.format(
+        user_table=User._meta.db_table,
+        question_table=Question._meta.db_table,
+        test_result_table=TestResult._meta.db_table,
+        user_answer_table=UserAnswer._meta.db_table,
+        on_conflict=ON_CONFLICT[mode],
+    )
+
+
+def get_params(
+    user_id: int | None,
+    question_id: int | None,
+    numbers: list[int] | None,
+    answer_key: AnswerKey | None,
+) -> dict[str, Any]:
+    valid = (
+        answer_key is not None and numbers is not None and answer_key.is_valid(numbers)
+    )
+    return {
+        'user_id': user_id,
+        'question_id': question_id,
+        'test_id': answer_key.test_id if answer_key else None,
+        'numbers': answer_key.get_numbers(numbers) if valid else [],
+        'valid': valid,
+        'correct': (
+            valid and not grading.is_deferred() and answer_key.is_correct(numbers)
+        ),
+    }
+
+
+def get_response(
+    data: dict[str, Any],
+    params: dict[str, Any],
+    numbers: list[int] | None,
+    errors: dict[str, Any],
+    answer_key: AnswerKey | None,
+    row: tuple,
+) -> dict[str, Any]:
+    answer_id, user_exists, question_exists, attempt_exists, answered = row
+
+    if params['user_id'] is not None and not user_exists:
+        errors['user_id'] = does_not_exist(data['user_id'])
+    if params['question_id'] is not None and not question_exists:
+        errors['question_id'] = does_not_exist(data['question_id'])
+    if errors:
+        # Порядок полей как в сериализаторе.
+        raise ValidationError(
+            {
+                field: errors[field]
+                for field in ('user_id', 'question_id', 'numbers')
+                if field in errors
+            }
+        )
+
+    if answer_id is not None:
+        return {
+            'id': answer_id,
+            'user_id': params['user_id'],
+            'question_id': params['question_id'],
+            'selected_choices': answer_key.get_option_ids(numbers),
+        }
+    if answered and not grading.is_deferred():
+        raise unique_error()
+    if not attempt_exists:
+        raise non_field_error('Пользователь не начал этот тест.')
+    if not answer_key.is_valid(numbers):
+        raise non_field_error('Некорректные номера ответов.')
+    # Ответ сохранён параллельным запросом после начала нашего.
+    raise unique_error()
+
+
+def non_field_error(message: str) -> ValidationError:
+    return ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+
+
+def unique_error() -> ValidationError:
+    return non_field_error(
+        str(UniqueTogetherValidator.message).format(field_names='user_id, question_id')
+    )
@@ -0,0 +1,98 @@
+"""Перенос завершённых попыток в архив.
+
+Попытка вместе с ответами удаляется из tests_testresult и users_useranswer и
+сохраняется одной строкой в секционированной таблице tests_archivedattempt.
+Каждая пачка переносится одним запросом, поэтому пачка либо перенесена
+целиком, либо не перенесена. Строки, заблокированные другими транзакциями,
+пропускаются до следующего запуска.
+"""
+
+from datetime import datetime
+
+from django.db import connection
+
+from apps.tests.models import ArchivedAttempt, Question, TestResult
+from apps.users.models import UserAnswer
+
+ARCHIVE_ATTEMPTS_SQL = """
+WITH attempts AS (
+    DELETE FROM {test_result_table}
+    WHERE id IN (
+        SELECT id
+        FROM {test_result_table}
+        WHERE status AND finished_at < %(cutoff)s
+        ORDER BY finished_at
+        LIMIT %(chunk_size)s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING test_id, user_id, results, total_questions, finished_at
+),
+answers AS (
+    DELETE FROM {user_answer_table} ua
+    USING {question_table} q, attempts a
+    WHERE ua.question_id = q.id AND q.test_id = a.test_id AND ua.user_id = a.user_id
+    RETURNING q.test_id, ua.user_id, ua.question_id, ua.selected_numbers
+)
+INSERT INTO {archived_attempt_table} (
+    test_id, user_id, results, total_questions, finished_at, answers
+)
+SELECT
+    a.test_id,
+    a.user_id,
+    a.results,
+    a.total_questions,
+    a.finished_at,
+    coalesce(
+        (
+            SELECT jsonb_object_agg(an.question_id, an.selected_numbers)
+            FROM answers an
+            WHERE an.test_id = a.test_id AND an.user_id = a.user_id
+        ),
+        '{{}}'
+    )
+FROM attempts a
+"""
+
+
+def archive_attempts(cutoff: datetime, chunk_size: int) -> int:
+    """Переносит в архив до chunk_size попыток, завершённых раньше cutoff."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            ARCHIVE_ATTEMPTS_SQL.format(
+                test_result_table=TestResult._meta.db_table,
+                user_answer_table=UserAnswer._meta.db_table,
+                question_table=Question._meta.db_table,
+                archived_attempt_table=ArchivedAttempt._meta.db_table,
+            ),
+            {'cutoff': cutoff, 'chunk_size': chunk_size},
+        )
+        return cursor.rowcount
+
+
+def get_archived_answers(
+    user_id: int | str, test_id: int
+) -> list[tuple[int, list[int]]]:
+    """Ответы попытки из архива как строки (question_id, selected_numbers)."""
+    answers = (
+        ArchivedAttempt.objects.filter(test_id=test_id, user_id=user_id)
+        .values_list('answers', flat=True)
+        .first()
+    )
+    return _answer_rows(answers)
+
+
+async def aget_archived_answers(
+    user_id: int | str, test_id: int
+) -> list[tuple[int, list[int]]]:
+    answers = (
+        await ArchivedAttempt.objects.filter(test_id=test_id, user_id=user_id)
+        .values_list('answers', flat=True)
+        .afirst()
+    )
+    return _answer_rows(answers)
+
+
+def _answer_rows(answers: dict | None) -> list[tuple[int, list[int]]]:
+    return [
+        (int(question_id), numbers) for question_id, numbers in (answers or {}).items()
+    ]
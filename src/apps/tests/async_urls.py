@@ -0,0 +1,13 @@
+from django.urls import path
+
+from apps.tests import async_views
+
+app_name = 'apps.tests.async'
+
+urlpatterns = [
+    path('tests/start-test/', async_views.start_test, name='test-start-test'),
+    path('tests/save-answer/', async_views.save_answer, name='test-save-answer'),
+    path('tests/<int:pk>/', async_views.retrieve, name='test-detail'),
+    path('tests/<int:pk>/user-test/', async_views.user_test, name='test-user-test'),
+    path('tests/<int:pk>/end-test/', async_views.end_test, name='test-end-test'),
+]
@@ -0,0 +1,237 @@
+"""Асинхронные версии горячих эндпоинтов сущности test для ASGI.
+
+Чтение выполняется через асинхронный ORM Django. Записи, которые должны
+происходить в одной транзакции, выполняются в потоке через sync_to_async,
+так как асинхронный ORM не поддерживает транзакции.
+"""
+
+import json
+from functools import wraps
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator
+
+from apps.tests import answer_writer, grading, payload_cache, readers
+from apps.tests.answer_buffer import answer_buffer
+from apps.tests.answer_keys import AnswerKey, answer_keys
+from apps.tests.models import ArchivedAttempt, Question, Test, TestResult
+from apps.tests.request_data import does_not_exist, get_numbers, get_pk, invalid_data
+from apps.tests.serializers.test import CompletionTestSerializer
+from apps.users.models import User, UserAnswer
+
+
+class RequestValidationError(Exception):
+    def __init__(self, detail: dict[str, Any] | list[str]) -> None:
+        self.detail = detail
+
+
+def json_response(data: Any, status: int = 200) -> JsonResponse:
+    return JsonResponse(
+        data, status=status, safe=False, json_dumps_params={'ensure_ascii': False}
+    )
+
+
+def handle_validation_errors(view):
+    @wraps(view)
+    async def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        try:
+            return await view(request, *args, **kwargs)
+        except RequestValidationError as exc:
+            return json_response(exc.detail, status=400)
+
+    return wrapper
+
+
+def unique_error(*field_names: str) -> RequestValidationError:
+    message = str(UniqueTogetherValidator.message).format(
+        field_names=', '.join(field_names)
+    )
+    return RequestValidationError({'non_field_errors': [message]})
+
+
+def parse_body(request: HttpRequest) -> dict[str, Any]:
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError as exc:
+        raise RequestValidationError({'detail': f'JSON parse error - {exc}'})
+    if not isinstance(data, dict):
+        raise RequestValidationError(invalid_data(data))
+    return data
+
+
+async def check_exists(
+    model: type, data: dict[str, Any], pk: int | None, field: str, errors: dict
+) -> None:
+    if pk is not None and not await model.objects.filter(pk=pk).aexists():
+        errors[field] = does_not_exist(data[field])
+
+
+@csrf_exempt
+@require_POST
+@handle_validation_errors
+async def start_test(request: HttpRequest) -> HttpResponse:
+    data = parse_body(request)
+    errors = {}
+    user_id = get_pk(data, 'user_id', errors)
+    test_id = get_pk(data, 'test_id', errors)
+    await check_exists(User, data, user_id, 'user_id', errors)
+    await check_exists(Test, data, test_id, 'test_id', errors)
+    if errors:
+        raise RequestValidationError(errors)
+
+    if await TestResult.objects.filter(user_id=user_id, test_id=test_id).aexists():
+        raise unique_error('user_id', 'test_id')
+    if await ArchivedAttempt.objects.filter(user_id=user_id, test_id=test_id).aexists():
+        raise unique_error('user_id', 'test_id')
+
+    total_questions = await Question.objects.filter(test_id=test_id).acount()
+    try:
+        test_result = await TestResult.objects.acreate(
+            user_id=user_id, test_id=test_id, total_questions=total_questions
+        )
+    except IntegrityError:
+        raise unique_error('user_id', 'test_id')
+
+    return json_response(
+        {
+            'id': test_result.id,
+            'user_id': test_result.user_id,
+            'test_id': test_result.test_id,
+            'total_questions': test_result.total_questions,
+            'status': test_result.status,
+            'results': test_result.results,
+        }
+    )
+
+
+@csrf_exempt
+@require_POST
+@handle_validation_errors
+async def save_answer(request: HttpRequest) -> HttpResponse:
+    data = parse_body(request)
+    if not settings.ANSWER_BUFFER_ENABLED:
+        try:
+            user_answer = await answer_writer.asave_answer(data)
+        except ValidationError as exc:
+            raise RequestValidationError(exc.detail)
+        return json_response(user_answer)
+
+    errors = {}
+    user_id = get_pk(data, 'user_id', errors)
+    question_id = get_pk(data, 'question_id', errors)
+    numbers = get_numbers(data, errors)
+    await check_exists(User, data, user_id, 'user_id', errors)
+    answer_key = await answer_keys.aget(question_id) if question_id else None
+    if question_id is not None and answer_key is None:
+        await check_exists(Question, data, question_id, 'question_id', errors)
+    if errors:
+        raise RequestValidationError(errors)
+
+    if (
+        not grading.is_deferred()
+        and await UserAnswer.objects.filter(
+            user_id=user_id, question_id=question_id
+        ).aexists()
+    ):
+        raise unique_error('user_id', 'question_id')
+    if not await TestResult.objects.filter(
+        user_id=user_id, test_id=answer_key.test_id
+    ).aexists():
+        raise RequestValidationError(
+            {'non_field_errors': ['Пользователь не начал этот тест.']}
+        )
+    if not answer_key.is_valid(numbers):
+        raise RequestValidationError(
+            {'non_field_errors': ['Некорректные номера ответов.']}
+        )
+    return await _buffer_answer(user_id, question_id, answer_key, numbers)
+
+
+async def _buffer_answer(
+    user_id: int, question_id: int, answer_key: AnswerKey, numbers: list[int]
+) -> HttpResponse:
+    numbers = answer_key.get_numbers(numbers)
+    if not await sync_to_async(answer_buffer.append, thread_sensitive=False)(
+        user_id,
+        answer_key.test_id,
+        question_id,
+        numbers,
+        unique=not grading.is_deferred(),
+    ):
+        raise unique_error('user_id', 'question_id')
+    return json_response(
+        {
+            'id': None,
+            'user_id': user_id,
+            'question_id': question_id,
+            'selected_choices': answer_key.get_option_ids(numbers),
+        },
+        status=202,
+    )
+
+
+@require_GET
+async def retrieve(request: HttpRequest, pk: int) -> HttpResponse:
+    test = await Test.objects.filter(pk=pk).values('id', 'title', 'version').afirst()
+    if test is None:
+        raise Http404
+    version = test.pop('version')
+
+    etag = payload_cache.get_etag(test['id'], version)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        key = payload_cache.get_cache_key(test['id'], version, renderer.format)
+        content = await payload_cache.aget_payload(key)
+        if content is None:
+            content = renderer.render(await readers.aread_test(test))
+            await payload_cache.aset_payload(key, content)
+        response = HttpResponse(content, content_type=renderer.media_type)
+    response['ETag'] = etag
+    return response
+
+
+@require_GET
+async def user_test(request: HttpRequest, pk: int) -> HttpResponse:
+    test = await Test.objects.filter(pk=pk).values('id', 'title').afirst()
+    if test is None:
+        raise Http404
+    user_id = request.GET.get('user_id')
+    if settings.ANSWER_BUFFER_ENABLED:
+        await sync_to_async(answer_buffer.flush_attempt)(user_id, pk)
+    return json_response(await readers.aread_user_test(test, user_id))
+
+
+@csrf_exempt
+@require_POST
+@handle_validation_errors
+async def end_test(request: HttpRequest, pk: int) -> HttpResponse:
+    user_id = request.GET.get('user_id')
+    if settings.ANSWER_BUFFER_ENABLED:
+        await sync_to_async(answer_buffer.flush_attempt)(user_id, pk)
+    test_result = await TestResult.objects.filter(test_id=pk, user_id=user_id).afirst()
+    if test_result is None:
+        if not await ArchivedAttempt.objects.filter(
+            test_id=pk, user_id=user_id
+        ).aexists():
+            raise Http404
+        raise RequestValidationError(['Тест уже завершён!'])
+    if test_result.status is True:
+        raise RequestValidationError(['Тест уже завершён!'])
+
+    test_result.status = True
+    test_result.finished_at = timezone.now()
+    if grading.is_deferred():
+        test_result.results = await grading.acount_correct_answers(user_id, pk)
+    await test_result.asave(update_fields=['status', 'results', 'finished_at'])
+    return json_response(CompletionTestSerializer(test_result).data)
@@ -0,0 +1,52 @@
+"""Начало теста сразу для группы пользователей одним SQL-запросом.
+
+Количество вопросов теста считается один раз на весь запрос. Пользователи,
+у которых уже есть попытка, текущая или перенесённая в архив, пропускаются:
+текущие — через ON CONFLICT DO NOTHING, поэтому одновременный start-test
+того же пользователя не приводит к ошибке.
+"""
+
+from django.db import connection
+
+from apps.tests.models import ArchivedAttempt, Question, TestResult
+
+START_TESTS_SQL = """
+WITH test AS (
+    SELECT count(*) AS total_questions
+    FROM {question_table}
+    WHERE test_id = %(test_id)s
+)
+INSERT INTO {test_result_table} (user_id, test_id, status, results, total_questions)
+SELECT DISTINCT u.id, %(test_id)s, false, 0, test.total_questions
+FROM unnest(%(user_ids)s::bigint[]) AS u (id), test
+WHERE NOT EXISTS (
+    SELECT FROM {archived_attempt_table}
+    WHERE test_id = %(test_id)s AND user_id = u.id
+)
+ORDER BY u.id
+ON CONFLICT (user_id, test_id) DO NOTHING
+RETURNING id, user_id, total_questions
+"""
+
+
+def start_tests(test_id: int, user_ids: list[int]) -> list[TestResult]:
+    """Создаёт попытки теста для пользователей, у которых их ещё нет."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            START_TESTS_SQL.format(
+                question_table=Question._meta.db_table,
+                test_result_table=TestResult._meta.db_table,
+                archived_attempt_table=ArchivedAttempt._meta.db_table,
+            ),
+            {'test_id': test_id, 'user_ids': user_ids},
+        )
+        rows = cursor.fetchall()
+    return [
+        TestResult(
+            id=attempt_id,
+            user_id=user_id,
+            test_id=test_id,
+            total_questions=total_questions,
+        )
+        for attempt_id, user_id, total_questions in sorted(rows, key=lambda row: row[1])
+    ]
@@ -0,0 +1,212 @@
+"""Потоковая выгрузка результатов теста в CSV и Parquet.
+
+Строки читаются через .iterator(chunk_size=EXPORT_CHUNK_SIZE), то есть
+серверным курсором PostgreSQL, и сразу отдаются пачками. Поэтому память не
+зависит от количества попыток. Попытки, перенесённые в архив, выгружаются
+после текущих.
+
+Parquet требует пакет pyarrow; каждая пачка строк записывается отдельной
+группой строк файла.
+
+Под ASGI выгрузка отдаётся асинхронным итератором astream: иначе Django
+собирает синхронный итератор в список целиком перед отправкой.
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterator, Iterable, Iterator
+from datetime import datetime
+from itertools import chain, islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.tests.answer_keys import answer_keys
+from apps.tests.models import ArchivedAttempt, Question, TestResult
+from apps.users.models import UserAnswer
+
+COLUMNS = {
+    'attempts': (
+        'user_id',
+        'first_name',
+        'last_name',
+        'status',
+        'results',
+        'total_questions',
+        'finished_at',
+        'archived',
+    ),
+    'answers': ('user_id', 'question_id', 'selected_numbers', 'is_correct'),
+}
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def get_rows(test_id: int, rows: str) -> Iterator[tuple]:
+    """Строки выгрузки: по одной на попытку (attempts) или на ответ (answers)."""
+    if rows == 'answers':
+        return answer_rows(test_id)
+    return attempt_rows(test_id)
+
+
+def attempt_rows(test_id: int) -> Iterator[tuple]:
+    fields = ('user_id', 'user__first_name', 'user__last_name')
+    results = fields + ('status', 'results', 'total_questions', 'finished_at')
+    for row in (
+        TestResult.objects.filter(test_id=test_id)
+        .order_by('id')
+        .values_list(*results)
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    ):
+        yield *row, False
+
+    archived = fields + ('results', 'total_questions', 'finished_at')
+    for *user, results, total_questions, finished_at in (
+        ArchivedAttempt.objects.filter(test_id=test_id)
+        .order_by('user_id')
+        .values_list(*archived)
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    ):
+        yield *user, True, results, total_questions, finished_at, True
+
+
+def answer_rows(test_id: int) -> Iterator[tuple]:
+    keys = answer_keys.get_many(
+        Question.objects.filter(test_id=test_id).values_list('id', flat=True)
+    )
+    answers = (
+        UserAnswer.objects.filter(question__test_id=test_id)
+        .order_by('user_id', 'question_id')
+        .values_list('user_id', 'question_id', 'selected_numbers')
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    )
+    archived_answers = (
+        (user_id, int(question_id), numbers)
+        for user_id, answers in ArchivedAttempt.objects.filter(test_id=test_id)
+        .order_by('user_id')
+        .values_list('user_id', 'answers')
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+        for question_id, numbers in answers.items()
+    )
+    for user_id, question_id, numbers in chain(answers, archived_answers):
+        answer_key = keys.get(question_id)
+        yield (
+            user_id,
+            question_id,
+            numbers,
+            answer_key is not None and answer_key.is_correct(numbers),
+        )
+
+
+def chunks(rows: Iterable[tuple]) -> Iterator[list[tuple]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, settings.EXPORT_CHUNK_SIZE)):
+        yield chunk
+
+
+def stream_csv(columns: tuple[str, ...], rows: Iterable[tuple]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in chunks(rows):
+        writer.writerows(map(_csv_row, chunk))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _csv_row(row: tuple) -> list:
+    return [
+        (
+            ' '.join(map(str, value))
+            if isinstance(value, list)
+            else value.isoformat() if isinstance(value, datetime) else value
+        )
+        for value in row
+    ]
+
+
+def stream_parquet(columns: tuple[str, ...], rows: Iterable[tuple]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        'user_id': pa.int64(),
+        'first_name': pa.string(),
+        'last_name': pa.string(),
+        'status': pa.bool_(),
+        'results': pa.int32(),
+        'total_questions': pa.int32(),
+        'finished_at': pa.timestamp('us', tz='UTC'),
+        'archived': pa.bool_(),
+        'question_id': pa.int64(),
+        'selected_numbers': pa.list_(pa.int32()),
+        'is_correct': pa.bool_(),
+    }
+    schema = pa.schema([(column, types[column]) for column in columns])
+    sink = StreamSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunks(rows):
+            writer.write_table(
+                pa.Table.from_pylist(
+                    [dict(zip(columns, row)) for row in chunk], schema=schema
+                )
+            )
+            yield sink.take()
+    # Метаданные файла записываются при закрытии.
+    yield sink.take()
+
+
+class StreamSink:
+    """Файл для ParquetWriter, содержимое которого отдаётся по частям."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self.buffer = io.BytesIO()
+        self.position = 0
+
+    def write(self, data: bytes) -> int:
+        self.position += len(data)
+        return self.buffer.write(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+
+STREAMS = {
+    'csv': stream_csv,
+    'parquet': stream_parquet,
+}
+
+
+def stream(test_id: int, rows: str, output: str) -> Iterator[bytes]:
+    return STREAMS[output](COLUMNS[rows], get_rows(test_id, rows))
+
+
+async def astream(test_id: int, rows: str, output: str) -> AsyncIterator[bytes]:
+    # Все части читаются в одном потоке: серверный курсор привязан к
+    # соединению с БД этого потока.
+    parts = stream(test_id, rows, output)
+    next_part = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (part := await next_part(parts, None)) is not None:
+            yield part
+    finally:
+        await sync_to_async(parts.close, thread_sensitive=True)()
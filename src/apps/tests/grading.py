@@ -0,0 +1,40 @@
+"""Подсчёт баллов попытки.
+
+В режиме GRADING_MODE=immediate результат попытки увеличивается при
+сохранении каждого верного ответа. В режиме deferred ответы только
+сохраняются (повторный ответ заменяет предыдущий), а баллы считаются одним
+запросом при завершении теста.
+"""
+
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import OuterRef, QuerySet
+
+from apps.tests.models import AnswerOption
+from apps.users.models import UserAnswer
+
+
+def is_deferred() -> bool:
+    return settings.GRADING_MODE == 'deferred'
+
+
+def count_correct_answers(user_id: int | str, test_id: int | str) -> int:
+    return _correct_answers(user_id, test_id).count()
+
+
+async def acount_correct_answers(user_id: int | str, test_id: int | str) -> int:
+    return await _correct_answers(user_id, test_id).acount()
+
+
+def _correct_answers(user_id: int | str, test_id: int | str) -> QuerySet:
+    # Ответ верный, если все выбранные варианты верные, как в AnswerKey.is_correct.
+    correct_numbers = ArraySubquery(
+        AnswerOption.objects.filter(
+            question_id=OuterRef('question_id'), is_correct=True
+        ).values('number')
+    )
+    return UserAnswer.objects.filter(
+        user_id=user_id,
+        question__test_id=test_id,
+        selected_numbers__contained_by=correct_numbers,
+    )
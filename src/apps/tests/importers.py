@@ -0,0 +1,380 @@
+import csv
+import hashlib
+import io
+import json
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import groupby, islice
+
+import pandas as pd
+from django.db import connection
+from django.db.backends.utils import CursorWrapper
+
+from apps.tests.models import AnswerOption, Question, Test, TestResult
+from apps.users.models import UserAnswer
+
+
+@dataclass
+class QuestionRow:
+    test_title: str
+    text: str
+    question_type: str
+    choices: list[str]
+    correct_answers: set[int]
+
+    @property
+    def content_hash(self) -> str:
+        """Отпечаток вопроса вместе с вариантами ответов."""
+        content = [self.question_type, self.choices, sorted(self.correct_answers)]
+        return hashlib.sha256(
+            json.dumps(content, ensure_ascii=False).encode()
+        ).hexdigest()
+
+
+def read_rows(
+    csv_file_path: str, chunk_size: int | None = None
+) -> Iterator[QuestionRow]:
+    """Строки CSV файла с вопросами; при chunk_size файл читается частями."""
+    if chunk_size:
+        frames = pd.read_csv(csv_file_path, dtype=str, chunksize=chunk_size)
+    else:
+        frames = [pd.read_csv(csv_file_path, dtype=str)]
+
+    test_title = None
+    for frame in frames:
+        frame['test_title'] = frame['test_title'].ffill()
+        if test_title is not None:
+            frame['test_title'] = frame['test_title'].fillna(test_title)
+        test_title = frame['test_title'].iloc[-1]
+        for row in frame.itertuples(index=False):
+            yield QuestionRow(
+                test_title=row.test_title,
+                text=row.question_text,
+                question_type=row.question_type,
+                choices=[c.strip() for c in row.choices.split(',')],
+                correct_answers={
+                    int(n.strip()) for n in row.correct_answers.split(',')
+                },
+            )
+
+
+def batched(
+    rows: Iterable[QuestionRow], batch_size: int
+) -> Iterator[list[QuestionRow]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def group_by_test(rows: Iterable[QuestionRow]) -> Iterator[list[QuestionRow]]:
+    """Вопросы, сгруппированные по тестам; вопросы теста должны идти подряд."""
+    seen_titles = set()
+    for test_title, test_rows in groupby(rows, key=lambda row: row.test_title):
+        if test_title in seen_titles:
+            raise ValueError(f'Вопросы теста "{test_title}" должны идти подряд.')
+        seen_titles.add(test_title)
+        yield list(test_rows)
+
+
+class OrmLoader:
+    """Загрузка вопросов через bulk_create, работает с любой БД."""
+
+    def __init__(self) -> None:
+        self.tests = {}
+
+    def load(self, rows: list[QuestionRow]) -> None:
+        self.load_tests({row.test_title for row in rows})
+
+        questions = Question.objects.bulk_create(
+            [
+                Question(
+                    test_id=self.tests[row.test_title],
+                    text=row.text,
+                    question_type=row.question_type,
+                    content_hash=row.content_hash,
+                )
+                for row in rows
+            ]
+        )
+        AnswerOption.objects.bulk_create(
+            [
+                AnswerOption(
+                    question=question,
+                    number=index,
+                    text=choice,
+                    is_correct=(index in row.correct_answers),
+                )
+                for question, row in zip(questions, rows)
+                for index, choice in enumerate(row.choices)
+            ]
+        )
+
+        Test.objects.filter(
+            pk__in={self.tests[row.test_title] for row in rows}
+        ).bump_version()
+
+    def load_tests(self, titles: set[str]) -> None:
+        titles = titles - self.tests.keys()
+        if not titles:
+            return
+        created_tests = Test.objects.bulk_create(
+            [Test(title=title) for title in titles],
+            update_conflicts=True,
+            update_fields=['title'],
+            unique_fields=['title'],
+        )
+        self.tests.update({test.title: test.pk for test in created_tests})
+
+
+CREATE_STAGING_TABLES_SQL = """
+DROP TABLE IF EXISTS pg_temp.import_questions, pg_temp.import_options;
+CREATE TEMPORARY TABLE pg_temp.import_questions (
+    seq integer PRIMARY KEY,
+    id bigint,
+    test_title varchar(128),
+    text varchar(256),
+    question_type varchar(10),
+    content_hash varchar(64)
+) ON COMMIT DROP;
+CREATE TEMPORARY TABLE pg_temp.import_options (
+    seq integer,
+    number integer,
+    text varchar(256),
+    is_correct boolean
+) ON COMMIT DROP;
+"""
+
+MERGE_STAGING_TABLES_SQL = """
+INSERT INTO {test_table} (title, version)
+SELECT DISTINCT test_title, 0 FROM pg_temp.import_questions
+ON CONFLICT (title) DO UPDATE SET version = {test_table}.version + 1;
+
+UPDATE pg_temp.import_questions
+SET id = nextval(pg_get_serial_sequence('{question_table}', 'id'));
+
+INSERT INTO {question_table} (id, test_id, text, question_type, content_hash)
+SELECT q.id, t.id, q.text, q.question_type, q.content_hash
+FROM pg_temp.import_questions q
+JOIN {test_table} t ON t.title = q.test_title
+ORDER BY q.seq;
+
+INSERT INTO {answer_option_table} (question_id, number, text, is_correct)
+SELECT q.id, o.number, o.text, o.is_correct
+FROM pg_temp.import_options o
+JOIN pg_temp.import_questions q ON q.seq = o.seq
+ORDER BY o.seq, o.number;
+"""
+
+
+class CopyLoader:
+    """Загрузка вопросов в PostgreSQL через COPY во временные таблицы.
+
+    Строки копируются в import_questions/import_options, после чего
+    переносятся в таблицы тестов, вопросов и вариантов ответов
+    несколькими запросами над множествами строк. Временные таблицы указаны
+    со схемой pg_temp, чтобы не задеть одноимённые постоянные таблицы.
+    """
+
+    def load(self, rows: list[QuestionRow]) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(CREATE_STAGING_TABLES_SQL)
+            copy_rows(
+                cursor,
+                'pg_temp.import_questions '
+                '(seq, test_title, text, question_type, content_hash)',
+                (
+                    (
+                        seq,
+                        row.test_title,
+                        row.text,
+                        row.question_type,
+                        row.content_hash,
+                    )
+                    for seq, row in enumerate(rows)
+                ),
+            )
+            copy_rows(
+                cursor,
+                'pg_temp.import_options (seq, number, text, is_correct)',
+                (
+                    (seq, index, choice, index in row.correct_answers)
+                    for seq, row in enumerate(rows)
+                    for index, choice in enumerate(row.choices)
+                ),
+            )
+            cursor.execute(
+                MERGE_STAGING_TABLES_SQL.format(
+                    test_table=Test._meta.db_table,
+                    question_table=Question._meta.db_table,
+                    answer_option_table=AnswerOption._meta.db_table,
+                )
+            )
+
+
+class IncrementalLoader:
+    """Синхронизация вопросов тестов с файлом по отпечаткам содержимого.
+
+    Вопрос определяется тестом, текстом и порядковым номером среди вопросов
+    теста с тем же текстом. Изменённые вопросы обновляются на месте,
+    отсутствующие в файле удаляются, новые добавляются; вопросы с
+    совпадающим отпечатком не затрагиваются. Вопросы, на которые уже есть
+    ответы пользователей, не удаляются: импорт завершается ошибкой. После
+    добавления и удаления вопросов пересчитывается количество вопросов в
+    попытках теста.
+    """
+
+    def __init__(self) -> None:
+        self.stats = Counter(created=0, updated=0, deleted=0, unchanged=0)
+
+    def load(self, rows: list[QuestionRow]) -> None:
+        tests_rows = defaultdict(list)
+        for row in rows:
+            tests_rows[row.test_title].append(row)
+        for test_title, test_rows in tests_rows.items():
+            self.load_test(test_title, test_rows)
+
+    def load_test(self, test_title: str, rows: list[QuestionRow]) -> None:
+        test, _ = Test.objects.get_or_create(title=test_title)
+        stored = dict(
+            self.with_keys(
+                (text, (question_id, content_hash))
+                for question_id, text, content_hash in Question.objects.filter(
+                    test=test
+                )
+                .order_by('id')
+                .values_list('id', 'text', 'content_hash')
+            )
+        )
+        incoming = dict(self.with_keys((row.text, row) for row in rows))
+
+        created = [row for key, row in incoming.items() if key not in stored]
+        deleted = [
+            question_id
+            for key, (question_id, _) in stored.items()
+            if key not in incoming
+        ]
+        updated = {
+            stored[key][0]: row
+            for key, row in incoming.items()
+            if key in stored and stored[key][1] != row.content_hash
+        }
+        self.stats.update(
+            created=len(created),
+            updated=len(updated),
+            deleted=len(deleted),
+            unchanged=len(incoming) - len(created) - len(updated),
+        )
+        if not (created or updated or deleted):
+            return
+
+        if deleted:
+            self.check_unanswered(test_title, deleted)
+            Question.objects.filter(pk__in=deleted).delete()
+        if updated:
+            self.update_questions(updated)
+        if created:
+            loader = OrmLoader()
+            loader.tests[test_title] = test.pk
+            loader.load(created)
+        if created or deleted:
+            TestResult.objects.filter(test=test).update(
+                total_questions=Question.objects.filter(test=test).count()
+            )
+
+        Test.objects.filter(pk=test.pk).bump_version()
+
+    @staticmethod
+    def check_unanswered(test_title: str, question_ids: list[int]) -> None:
+        answered = sorted(
+            UserAnswer.objects.filter(question_id__in=question_ids)
+            .values_list('question_id', flat=True)
+            .distinct()
+        )
+        if answered:
+            raise ValueError(
+                f'Тест «{test_title}»: вопросы {", ".join(map(str, answered))} '
+                'отсутствуют в файле, но на них уже есть ответы пользователей.'
+            )
+
+    @staticmethod
+    def with_keys(items: Iterable[tuple[str, object]]) -> Iterator[tuple]:
+        occurrences = Counter()
+        for text, item in items:
+            yield (text, occurrences[text]), item
+            occurrences[text] += 1
+
+    @staticmethod
+    def update_questions(updated: dict[int, QuestionRow]) -> None:
+        Question.objects.bulk_update(
+            [
+                Question(
+                    pk=question_id,
+                    question_type=row.question_type,
+                    content_hash=row.content_hash,
+                )
+                for question_id, row in updated.items()
+            ],
+            fields=['question_type', 'content_hash'],
+        )
+
+        stored_options = {
+            (question_id, number): answer_option_id
+            for answer_option_id, question_id, number in AnswerOption.objects.filter(
+                question_id__in=updated
+            ).values_list('id', 'question_id', 'number')
+        }
+        incoming_options = {
+            (question_id, number): AnswerOption(
+                question_id=question_id,
+                number=number,
+                text=choice,
+                is_correct=(number in row.correct_answers),
+            )
+            for question_id, row in updated.items()
+            for number, choice in enumerate(row.choices)
+        }
+
+        changed_options = []
+        for key, answer_option in incoming_options.items():
+            answer_option.pk = stored_options.get(key)
+            if answer_option.pk is not None:
+                changed_options.append(answer_option)
+        AnswerOption.objects.bulk_update(changed_options, fields=['text', 'is_correct'])
+        AnswerOption.objects.bulk_create(
+            [
+                answer_option
+                for answer_option in incoming_options.values()
+                if answer_option.pk is None
+            ]
+        )
+        AnswerOption.objects.filter(
+            pk__in=[
+                answer_option_id
+                for key, answer_option_id in stored_options.items()
+                if key not in incoming_options
+            ]
+        ).delete()
+
+
+def copy_rows(cursor: CursorWrapper, table: str, rows: Iterable[tuple]) -> None:
+    """COPY строк в таблицу для psycopg2 и psycopg 3."""
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, 'copy_expert'):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        raw_cursor.copy_expert(f'COPY {table} FROM STDIN WITH (FORMAT csv)', buffer)
+    else:
+        # write_row кодирует строки в текстовом формате COPY, а не в CSV.
+        with raw_cursor.copy(f'COPY {table} FROM STDIN') as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+def get_loader(backend: str) -> OrmLoader | CopyLoader:
+    if backend == 'auto':
+        backend = 'copy' if connection.vendor == 'postgresql' else 'orm'
+    if backend == 'copy':
+        return CopyLoader()
+    return OrmLoader()
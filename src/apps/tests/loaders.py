@@ -0,0 +1,59 @@
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.db.models import QuerySet
+
+from apps.tests.answer_keys import AnswerKey, answer_keys
+from apps.tests.archive import aget_archived_answers, get_archived_answers
+from apps.users.models import UserAnswer
+
+
+def load_selected_choices(user_id: int | str | None, test_id: int) -> dict[int, list]:
+    """Выбранные пользователем варианты ответов по всем вопросам теста за 1 запрос.
+
+    Идентификаторы вариантов берутся из ключей ответов по сохранённым номерам.
+    Если ответов нет, они ищутся в архиве попыток вторым запросом.
+    """
+    if not user_id:
+        return {}
+    rows = list(_selected_numbers_rows(user_id, test_id)) or get_archived_answers(
+        user_id, test_id
+    )
+    keys = answer_keys.get_many(question_id for question_id, _ in rows)
+    return _group_selected_choices(rows, keys)
+
+
+async def aload_selected_choices(
+    user_id: int | str | None, test_id: int
+) -> dict[int, list]:
+    if not user_id:
+        return {}
+    rows = [
+        row async for row in _selected_numbers_rows(user_id, test_id)
+    ] or await aget_archived_answers(user_id, test_id)
+    keys = await answer_keys.aget_many(question_id for question_id, _ in rows)
+    return _group_selected_choices(rows, keys)
+
+
+def _selected_numbers_rows(user_id: int | str, test_id: int) -> QuerySet:
+    return UserAnswer.objects.filter(
+        user_id=user_id, question__test_id=test_id
+    ).values_list('question_id', 'selected_numbers')
+
+
+def _group_selected_choices(
+    rows: Iterable[tuple], keys: dict[int, AnswerKey]
+) -> dict[int, list]:
+    selected_choices = defaultdict(list)
+    for question_id, numbers in rows:
+        # Вопрос архивной попытки мог быть удалён.
+        if question_id not in keys:
+            continue
+        option_ids = keys[question_id].option_ids
+        selected_choices[question_id] = [
+            {'id': option_ids[number], 'number': number}
+            for number in numbers
+            # Вариант мог быть удалён при повторном импорте теста.
+            if number in option_ids
+        ]
+    return selected_choices
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.tests.archive import archive_attempts
+
+
+class Command(BaseCommand):
+    help = (
+        'Перенос завершённых попыток старше заданного срока вместе с ответами '
+        'в секционированную таблицу архива'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=float,
+            default=30,
+            help='Переносить попытки, завершённые больше N дней назад',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество попыток, переносимых одним запросом',
+        )
+
+    def handle(self, *args, **kwargs):
+        cutoff = timezone.now() - timedelta(days=kwargs['days'])
+        archived = 0
+        while chunk := archive_attempts(cutoff, kwargs['chunk_size']):
+            archived += chunk
+            if kwargs['verbosity'] > 1:
+                self.stdout.write(f'Перенесено попыток: {archived}')
+        self.stdout.write(f'Перенесено в архив попыток: {archived}')
@@ -0,0 +1,73 @@
+import asyncio
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient
+
+from apps.tests.models import AnswerOption, Question, Test, TestResult
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Сравнение пропускной способности синхронных и асинхронных эндпоинтов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--questions', type=int, default=20)
+
+    def handle(self, *args, **kwargs):
+        test, user = self.seed(kwargs['questions'])
+        paths = {
+            'sync': f'/tests/{test.id}/user-test/?user_id={user.id}',
+            'async': f'/async/tests/{test.id}/user-test/?user_id={user.id}',
+        }
+        try:
+            for name, path in paths.items():
+                elapsed = asyncio.run(
+                    self.run(path, kwargs['requests'], kwargs['concurrency'])
+                )
+                self.stdout.write(
+                    f'{name}: {kwargs["requests"] / elapsed:.1f} req/s '
+                    f'({kwargs["requests"]} запросов за {elapsed:.2f} с, '
+                    f'параллельно {kwargs["concurrency"]})'
+                )
+        finally:
+            test.delete()
+            user.delete()
+
+    @staticmethod
+    def seed(questions_count: int) -> tuple[Test, User]:
+        test = Test.objects.create(title=f'bench-{uuid.uuid4().hex[:16]}')
+        user = User.objects.create(first_name='bench', last_name='bench')
+        questions = Question.objects.bulk_create(
+            Question(test=test, text=f'Вопрос {index}', question_type='single')
+            for index in range(questions_count)
+        )
+        AnswerOption.objects.bulk_create(
+            AnswerOption(
+                question=question,
+                text=f'Вариант {number}',
+                number=number,
+                is_correct=number == 0,
+            )
+            for question in questions
+            for number in range(4)
+        )
+        TestResult.objects.create(user=user, test=test, total_questions=questions_count)
+        return test, user
+
+    @staticmethod
+    async def run(path: str, requests: int, concurrency: int) -> float:
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch() -> None:
+            async with semaphore:
+                response = await client.get(path)
+                assert response.status_code == 200, response.status_code
+
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch() for _ in range(requests)))
+        return time.perf_counter() - started
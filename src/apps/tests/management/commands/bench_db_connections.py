@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.test import Client
+
+import core
+
+MODES = {
+    'новое соединение на запрос': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': '0'},
+    'постоянные соединения (CONN_MAX_AGE=600)': {
+        'DB_CONN_MAX_AGE': '600',
+        'DB_POOL': '0',
+    },
+    'пул psycopg 3': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': '1'},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнение времени запроса без переиспользования соединений с БД, '
+        'с постоянными соединениями и с пулом соединений'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--path', default='/tests/?limit=1')
+        # Замер в отдельном процессе с настройками БД из окружения.
+        parser.add_argument('--child', action='store_true', help='Служебный флаг')
+
+    def handle(self, *args, **kwargs):
+        if kwargs['child']:
+            timings = self.measure(kwargs['path'], kwargs['requests'])
+            self.stdout.write(json.dumps(timings))
+            return
+
+        for name, env in MODES.items():
+            process = subprocess.run(
+                [
+                    sys.executable,
+                    '-m',
+                    'django',
+                    'bench_db_connections',
+                    '--child',
+                    '--requests',
+                    str(kwargs['requests']),
+                    '--path',
+                    kwargs['path'],
+                ],
+                cwd=Path(core.__file__).resolve().parent.parent,
+                env={**os.environ, **env},
+                capture_output=True,
+                text=True,
+            )
+            if process.returncode:
+                error = process.stderr.strip().splitlines()[-1:]
+                self.stdout.write(f'{name}: недоступно ({"".join(error)})')
+                continue
+
+            timings = sorted(json.loads(process.stdout.strip().splitlines()[-1]))
+            self.stdout.write(
+                f'{name}: среднее {sum(timings) / len(timings) * 1000:.2f} мс, '
+                f'p50 {timings[len(timings) // 2] * 1000:.2f} мс, '
+                f'p95 {timings[int(len(timings) * 0.95)] * 1000:.2f} мс'
+            )
+
+    @staticmethod
+    def measure(path: str, requests: int) -> list[float]:
+        client = Client()
+        timings = []
+        for index in range(requests + 10):
+            started = time.perf_counter()
+            # Как и обработчик запросов Django, закрываем устаревшие соединения
+            # в начале и в конце запроса; тестовый клиент этого не делает.
+            close_old_connections()
+            response = client.get(path)
+            close_old_connections()
+            elapsed = time.perf_counter() - started
+            assert response.status_code == 200, response.status_code
+            # Первые запросы прогревают соединения и кэши.
+            if index >= 10:
+                timings.append(elapsed)
+        return timings
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.transaction import atomic
+
+from apps.tests.importers import CopyLoader, OrmLoader, QuestionRow, batched
+
+
+class Command(BaseCommand):
+    help = 'Сравнение скорости загрузки вопросов через ORM и COPY'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--tests', type=int, default=100)
+
+    def handle(self, *args, **kwargs):
+        if connection.vendor != 'postgresql':
+            raise CommandError('COPY доступен только для PostgreSQL.')
+
+        rows = [
+            QuestionRow(
+                test_title=f'bench-import-{index % kwargs["tests"]}',
+                text=f'Вопрос {index}',
+                question_type='multiple',
+                choices=[f'Вариант {number}' for number in range(4)],
+                correct_answers={0, 2},
+            )
+            for index in range(kwargs['rows'])
+        ]
+
+        for name, loader_class in (('orm', OrmLoader), ('copy', CopyLoader)):
+            loader = loader_class()
+            started = time.perf_counter()
+            with atomic():
+                for batch in batched(rows, kwargs['batch_size']):
+                    with atomic():
+                        loader.load(batch)
+                elapsed = time.perf_counter() - started
+                # Данные бенчмарка не сохраняются.
+                transaction.set_rollback(True)
+            self.stdout.write(
+                f'{name}: {len(rows) / elapsed:.0f} строк/с '
+                f'({len(rows)} строк за {elapsed:.2f} с)'
+            )
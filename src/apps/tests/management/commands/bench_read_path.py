@@ -0,0 +1,123 @@
+import time
+import uuid
+from collections.abc import Callable
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from apps.tests import readers
+from apps.tests.loaders import load_selected_choices
+from apps.tests.models import AnswerOption, Question, Test, TestResult
+from apps.tests.serializers.test import (
+    TestGETSerializer,
+    TestListGETSerializer,
+    TestResultGETSerializer,
+)
+from apps.users.models import User, UserAnswer
+
+# Вопросы и варианты ответов для сериализаторов загружаются заранее.
+QUESTIONS = 'questions__answer_options'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнение скорости ответов сериализаторов и чтения через .values(); '
+        'совпадение ответов проверяют тесты apps.tests.tests.test_readers'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--tests', type=int, default=20)
+        parser.add_argument('--questions', type=int, default=50)
+
+    def handle(self, *args, **kwargs):
+        tests, user = self.seed(kwargs['tests'], kwargs['questions'])
+        test_ids = [test.id for test in tests]
+        test = {'id': tests[0].id, 'title': tests[0].title}
+        queryset = Test.objects.filter(pk__in=test_ids)
+        fields = set(TestListGETSerializer.Meta.fields)
+        try:
+            cases = {
+                'test': (
+                    lambda: TestGETSerializer(
+                        Test.objects.prefetch_related(QUESTIONS).get(pk=test['id'])
+                    ).data,
+                    lambda: readers.read_test(test),
+                ),
+                'user-test': (
+                    lambda: TestResultGETSerializer(
+                        Test.objects.prefetch_related(QUESTIONS).get(pk=test['id']),
+                        context={
+                            'selected_choices': load_selected_choices(
+                                user.id, test['id']
+                            )
+                        },
+                    ).data,
+                    lambda: readers.read_user_test(test, user.id),
+                ),
+                'list': (
+                    lambda: TestListGETSerializer(
+                        queryset.prefetch_related(QUESTIONS).annotate(
+                            questions_count=Count('questions')
+                        ),
+                        many=True,
+                    ).data,
+                    lambda: readers.read_test_list(
+                        list(queryset.values_for_fields(fields)), fields
+                    ),
+                ),
+            }
+            for name, (serialize, read) in cases.items():
+                serializer_time = self.measure(serialize, kwargs['iterations'])
+                reader_time = self.measure(read, kwargs['iterations'])
+                self.stdout.write(
+                    f'{name}: сериализатор {serializer_time * 1000:.2f} мс, '
+                    f'.values() {reader_time * 1000:.2f} мс, '
+                    f'ускорение x{serializer_time / reader_time:.1f}'
+                )
+        finally:
+            queryset.delete()
+            user.delete()
+
+    @staticmethod
+    def measure(func: Callable, iterations: int) -> float:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - started) / iterations
+
+    @staticmethod
+    def seed(tests_count: int, questions_count: int) -> tuple[list[Test], User]:
+        prefix = f'bench-{uuid.uuid4().hex[:16]}'
+        tests = Test.objects.bulk_create(
+            Test(title=f'{prefix}-{index}') for index in range(tests_count)
+        )
+        user = User.objects.create(first_name='bench', last_name='bench')
+        questions = Question.objects.bulk_create(
+            Question(
+                test=test,
+                text=f'Вопрос {index}',
+                question_type='multiple' if index % 2 else 'single',
+            )
+            for test in tests
+            for index in range(questions_count)
+        )
+        AnswerOption.objects.bulk_create(
+            AnswerOption(
+                question=question,
+                text=f'Вариант {number}',
+                number=number,
+                is_correct=number == 0,
+            )
+            for question in questions
+            for number in range(4)
+        )
+        TestResult.objects.create(
+            user=user, test=tests[0], total_questions=questions_count
+        )
+        # Ответы на каждый второй вопрос первого теста.
+        UserAnswer.objects.bulk_create(
+            UserAnswer(user=user, question=question, selected_numbers=[0, 1])
+            for question in questions[:questions_count:2]
+        )
+        return tests, user
@@ -0,0 +1,84 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = 'Сравнение скорости JSONRenderer и ORJSONRenderer на документах тестов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--questions', type=int, default=100)
+
+    def handle(self, *args, **kwargs):
+        documents = {
+            'test': self.build_test(1, kwargs['questions'], with_selected=False),
+            'user-test': self.build_test(1, kwargs['questions'], with_selected=True),
+            'list': {
+                'count': 100,
+                'next': None,
+                'previous': None,
+                'results': [
+                    self.build_test(index, 10, with_selected=False)
+                    for index in range(100)
+                ],
+            },
+        }
+
+        for name, document in documents.items():
+            expected = JSONRenderer().render(document)
+            actual = ORJSONRenderer().render(document)
+            if json.loads(expected) != json.loads(actual):
+                raise CommandError(f'{name}: результаты рендеринга различаются')
+
+            timings = {}
+            for renderer in (JSONRenderer(), ORJSONRenderer()):
+                started = time.perf_counter()
+                for _ in range(kwargs['iterations']):
+                    renderer.render(document)
+                timings[type(renderer).__name__] = (
+                    time.perf_counter() - started
+                ) / kwargs['iterations']
+
+            self.stdout.write(
+                f'{name} ({len(expected)} байт): '
+                + ', '.join(
+                    f'{renderer} {timing * 1000:.3f} мс'
+                    for renderer, timing in timings.items()
+                )
+                + f', ускорение x{timings["JSONRenderer"] / timings["ORJSONRenderer"]:.1f}'
+            )
+
+    @staticmethod
+    def build_test(test_id: int, questions_count: int, with_selected: bool) -> dict:
+        questions = []
+        for question_id in range(questions_count):
+            answer_options = [
+                {
+                    'id': question_id * 4 + number,
+                    'text': f'Вариант ответа №{number} — «Интерпретируемый язык»',
+                    'number': number,
+                }
+                for number in range(4)
+            ]
+            question = {
+                'id': question_id,
+                'text': f'Вопрос {question_id}: выберите все правильные утверждения о воде.',
+                'question_type': 'multiple',
+                'answer_options': answer_options,
+            }
+            if with_selected:
+                question['selected_choices'] = [
+                    {'id': option['id'], 'number': option['number']}
+                    for option in answer_options[:2]
+                ]
+            questions.append(question)
+        return {
+            'id': test_id,
+            'title': f'Тест по Python №{test_id}',
+            'questions': questions,
+        }
@@ -0,0 +1,35 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tests import exports
+from apps.tests.models import Test
+
+
+class Command(BaseCommand):
+    help = 'Потоковая выгрузка результатов теста в CSV или Parquet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('test_id', type=int)
+        parser.add_argument('--rows', choices=list(exports.COLUMNS), default='attempts')
+        parser.add_argument('--output', choices=list(exports.STREAMS), default='csv')
+        parser.add_argument(
+            '--file', help='Путь к файлу; CSV без пути выводится в stdout'
+        )
+
+    def handle(self, *args, **kwargs):
+        if not Test.objects.filter(pk=kwargs['test_id']).exists():
+            raise CommandError(f'Тест {kwargs["test_id"]} не найден')
+        if kwargs['output'] == 'parquet' and not kwargs['file']:
+            raise CommandError('Для Parquet укажите --file')
+
+        content = exports.stream(kwargs['test_id'], kwargs['rows'], kwargs['output'])
+        if not kwargs['file']:
+            for data in content:
+                sys.stdout.buffer.write(data)
+            return
+        size = 0
+        with open(kwargs['file'], 'wb') as file:
+            for data in content:
+                size += file.write(data)
+        self.stderr.write(f'Записано {size} байт в {kwargs["file"]}')
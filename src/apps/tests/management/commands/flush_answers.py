@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.tests.answer_buffer import answer_buffer
+
+
+class Command(BaseCommand):
+    help = (
+        'Перенос ответов из журналов отложенной записи в БД; после сбоя '
+        'переносит оставшиеся журналы повторно'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Повторять перенос каждые N секунд; 0 — перенести один раз',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.ANSWER_BUFFER_BATCH_SIZE,
+            help='Количество журналов попыток в одной транзакции',
+        )
+
+    def handle(self, *args, **kwargs):
+        while True:
+            saved = answer_buffer.flush(kwargs['batch_size'])
+            if saved or not kwargs['interval']:
+                self.stdout.write(f'Сохранено ответов: {saved}')
+            if not kwargs['interval']:
+                return
+            time.sleep(kwargs['interval'])
@@ -1,8 +1,18 @@
-import pandas as pd
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
 from django.db.transaction import atomic
 
-from apps.tests.models import AnswerOption, Question, Test
+from apps.tests.importers import (
+    CopyLoader,
+    IncrementalLoader,
+    OrmLoader,
+    batched,
+    get_loader,
+    group_by_test,
+    read_rows,
+)
 
 
 class Command(BaseCommand):
@@ -10,71 +20,84 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('csv_file', type=str, help='Путь к CSV файлу')
-
-    @atomic
-    def handle(self, *args, **kwargs):
-        csv_file_path = kwargs['csv_file']
-        df = pd.read_csv(csv_file_path)
-
-        df['test_title'] = df['test_title'].ffill()
-
-        unique_tests = df['test_title'].unique()
-
-        tests_objs = [Test(title=title) for title in unique_tests]
-        created_tests = Test.objects.bulk_create(
-            tests_objs,
-            update_conflicts=True,
-            update_fields=['title'],
-            unique_fields=['title'],
+        parser.add_argument(
+            '--backend',
+            choices=['auto', 'orm', 'copy'],
+            default='auto',
+            help=(
+                'Способ загрузки: copy — COPY во временные таблицы (PostgreSQL), '
+                'orm — bulk_create, auto — copy для PostgreSQL, иначе orm'
+            ),
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help=(
+                'Обновить только изменившиеся вопросы, сравнив отпечатки '
+                'содержимого с сохранёнными'
+            ),
+        )
+        parser.add_argument(
+            '--stream',
+            action='store_true',
+            help='Читать файл частями и сохранять пачками в отдельных транзакциях',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Количество строк CSV, читаемых за раз в режиме --stream',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество вопросов в одной транзакции в режиме --stream',
         )
-        tests_map = {test.title: test for test in created_tests}
-
-        grouped = df.groupby('test_title')
-
-        questions_list = []
-        questions_info = []
-        for test_title, group in grouped:
-            test_obj = tests_map[test_title]
-            for _, row in group.iterrows():
-                questions_list.append(
-                    Question(
-                        test=test_obj,
-                        text=row['question_text'],
-                        question_type=row['question_type'],
-                    )
-                )
-                questions_info.append(
-                    {
-                        'question_text': row['question_text'],
-                        'test_title': test_title,
-                        'choices': [c.strip() for c in row['choices'].split(',')],
-                        'correct_answers': {
-                            int(n.strip()) for n in row['correct_answers'].split(',')
-                        },
-                    }
-                )
 
-        questions_in_db = Question.objects.bulk_create(questions_list)
+    def handle(self, *args, **kwargs):
+        if kwargs['backend'] == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError('COPY доступен только для PostgreSQL.')
+        if kwargs['incremental'] and kwargs['backend'] == 'copy':
+            raise CommandError('--incremental сохраняет вопросы без COPY.')
+        if kwargs['incremental']:
+            loader = IncrementalLoader()
+        else:
+            loader = get_loader(kwargs['backend'])
 
-        questions_map = {(q.test.title, q.text): q for q in questions_in_db}
+        try:
+            if kwargs['stream']:
+                self.import_stream(loader, **kwargs)
+            else:
+                with atomic():
+                    loader.load(list(read_rows(kwargs['csv_file'])))
+        except ValueError as exc:
+            raise CommandError(exc)
 
-        answers_data = []
-        for info in questions_info:
-            question_obj = questions_map[(info['test_title'], info['question_text'])]
-            choices = info['choices']
-            correct_indices = info['correct_answers']
-            answers_data.extend(
-                [
-                    AnswerOption(
-                        question=question_obj,
-                        number=index,
-                        text=choices[index],
-                        is_correct=(index in correct_indices),
-                    )
-                    for index in range(len(choices))
-                ]
+        if kwargs['incremental']:
+            self.stdout.write(
+                'Добавлено: {created}, обновлено: {updated}, удалено: {deleted}, '
+                'без изменений: {unchanged}'.format(**loader.stats)
             )
+        self.stdout.write(self.style.SUCCESS('Тесты успешно импортированы'))
 
-        AnswerOption.objects.bulk_create(answers_data)
+    def import_stream(
+        self, loader: OrmLoader | CopyLoader | IncrementalLoader, **kwargs
+    ) -> None:
+        rows = read_rows(kwargs['csv_file'], chunk_size=kwargs['chunk_size'])
+        if kwargs['incremental']:
+            # Вопросы теста синхронизируются целиком в одной транзакции.
+            batches = group_by_test(rows)
+        else:
+            batches = batched(rows, kwargs['batch_size'])
 
-        self.stdout.write(self.style.SUCCESS('Тесты успешно импортированы'))
+        imported = 0
+        started = time.perf_counter()
+        for batch in batches:
+            with atomic():
+                loader.load(batch)
+            imported += len(batch)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'Импортировано строк: {imported} ({imported / elapsed:.0f} строк/с)'
+            )
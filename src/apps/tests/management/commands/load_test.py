@@ -0,0 +1,293 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+import core
+from apps.tests.models import AnswerOption, Question, Test
+from apps.users.models import User
+
+ENDPOINTS = ('start-test', 'test', 'save-answer', 'user-test', 'end-test')
+
+# Ошибки уникальности содержат имена полей ограничения.
+CONSTRAINT_MARKERS = ('user_id, test_id', 'user_id, question_id')
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест: N пользователей одновременно проходят тест '
+        '(start-test, получение теста, save-answer, user-test, end-test)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--questions', type=int, default=20)
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument(
+            '--url',
+            default='http://127.0.0.1:8000',
+            help='Адрес запущенного сервера',
+        )
+        parser.add_argument(
+            '--spawn',
+            action='store_true',
+            help='Запустить uvicorn на порту из --url на время теста',
+        )
+        parser.add_argument('--workers', type=int, default=1, help='Воркеры uvicorn')
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help='Использовать асинхронные эндпоинты /async/',
+        )
+        parser.add_argument(
+            '--retry-rate',
+            type=float,
+            default=0.0,
+            help=(
+                'Доля запросов start-test и save-answer, отправляемых повторно, '
+                'как при перезагрузке страницы'
+            ),
+        )
+        parser.add_argument(
+            '--keep', action='store_true', help='Не удалять созданные данные'
+        )
+
+    def handle(self, *args, **kwargs):
+        test, users = self.seed(kwargs['users'], kwargs['questions'])
+        self.stdout.write(
+            f'Создан тест {test.id} с {kwargs["questions"]} вопросами '
+            f'и {len(users)} пользователей'
+        )
+        server = (
+            self.spawn(kwargs['url'], kwargs['workers']) if kwargs['spawn'] else None
+        )
+        try:
+            self.wait_ready(kwargs['url'], server)
+            runner = FlowRunner(
+                kwargs['url'] + ('/async' if kwargs['use_async'] else ''),
+                test.id,
+                kwargs['retry_rate'],
+            )
+            started = time.perf_counter()
+            runner.run(users, kwargs['concurrency'])
+            elapsed = time.perf_counter() - started
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+            if not kwargs['keep']:
+                test.delete()
+                User.objects.filter(pk__in=users).delete()
+
+        self.report(runner, elapsed)
+
+    def report(self, runner: 'FlowRunner', elapsed: float) -> None:
+        total = sum(len(timings) for timings in runner.timings.values())
+        self.stdout.write(
+            f'{total} запросов за {elapsed:.2f} с, {total / elapsed:.1f} req/s, '
+            f'завершили тест: {runner.completed}'
+        )
+        for endpoint in ENDPOINTS:
+            timings = sorted(runner.timings[endpoint])
+            if not timings:
+                continue
+            statuses = ', '.join(
+                f'{status}: {count}'
+                for status, count in sorted(
+                    runner.statuses[endpoint].items(), key=lambda item: str(item[0])
+                )
+            )
+            self.stdout.write(
+                f'{endpoint}: {len(timings)} запросов, '
+                f'p50 {percentile(timings, 50) * 1000:.1f} мс, '
+                f'p95 {percentile(timings, 95) * 1000:.1f} мс, '
+                f'p99 {percentile(timings, 99) * 1000:.1f} мс; '
+                f'статусы {statuses}; '
+                f'нарушения уникальности {runner.violations[endpoint]}'
+            )
+        errors = sum(
+            count
+            for statuses in runner.statuses.values()
+            for status, count in statuses.items()
+            if status == 'error' or status >= 500
+        )
+        if errors:
+            self.stdout.write(self.style.ERROR(f'Ошибок сервера и сети: {errors}'))
+
+    @staticmethod
+    def seed(users_count: int, questions_count: int) -> tuple[Test, list[int]]:
+        test = Test.objects.create(title=f'load-{uuid.uuid4().hex[:16]}')
+        questions = Question.objects.bulk_create(
+            Question(
+                test=test,
+                text=f'Вопрос {index}',
+                question_type='multiple' if index % 2 else 'single',
+            )
+            for index in range(questions_count)
+        )
+        AnswerOption.objects.bulk_create(
+            AnswerOption(
+                question=question,
+                text=f'Вариант {number}',
+                number=number,
+                is_correct=number == 0,
+            )
+            for question in questions
+            for number in range(4)
+        )
+        users = User.objects.bulk_create(
+            User(first_name='load', last_name=str(index))
+            for index in range(users_count)
+        )
+        return test, [user.id for user in users]
+
+    @staticmethod
+    def spawn(url: str, workers: int) -> subprocess.Popen:
+        port = url.rsplit(':', 1)[-1].strip('/')
+        return subprocess.Popen(
+            [
+                sys.executable,
+                '-m',
+                'uvicorn',
+                'core.asgi:application',
+                '--port',
+                port,
+                '--workers',
+                str(workers),
+                '--log-level',
+                'warning',
+            ],
+            cwd=Path(core.__file__).resolve().parent.parent,
+            env=os.environ.copy(),
+        )
+
+    @staticmethod
+    def wait_ready(
+        url: str, server: subprocess.Popen | None, timeout: float = 30
+    ) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                urllib.request.urlopen(f'{url}/tests/?limit=1', timeout=5).close()
+                return
+            except (urllib.error.URLError, ConnectionError):
+                if server is not None and server.poll() is not None:
+                    raise CommandError('Не удалось запустить uvicorn.')
+                if time.monotonic() > deadline:
+                    raise CommandError(f'Сервер {url} недоступен.')
+                time.sleep(0.2)
+
+
+class FlowRunner:
+    """Прохождение теста пользователями в потоках через HTTP."""
+
+    def __init__(self, base_url: str, test_id: int, retry_rate: float) -> None:
+        self.base_url = base_url
+        self.test_id = test_id
+        self.retry_rate = retry_rate
+        self.lock = threading.Lock()
+        self.timings = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.violations = Counter()
+        self.completed = 0
+
+    def run(self, users: list[int], concurrency: int) -> None:
+        # Все потоки начинают одновременно, как в начале экзамена.
+        parties = min(concurrency, len(users))
+        barrier = threading.Barrier(parties)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(
+                executor.map(
+                    lambda index, user_id: self.take_test(
+                        user_id, barrier if index < parties else None
+                    ),
+                    range(len(users)),
+                    users,
+                )
+            )
+
+    def take_test(self, user_id: int, barrier: threading.Barrier | None) -> None:
+        if barrier is not None:
+            try:
+                barrier.wait(timeout=60)
+            except threading.BrokenBarrierError:
+                pass
+
+        body = {'user_id': user_id, 'test_id': self.test_id}
+        if self.request('start-test', 'POST', '/tests/start-test/', body) is None:
+            return
+        if random.random() < self.retry_rate:
+            self.request('start-test', 'POST', '/tests/start-test/', body)
+
+        test = self.request('test', 'GET', f'/tests/{self.test_id}/')
+        if test is None:
+            return
+        for question in test['questions']:
+            numbers = [random.choice(question['answer_options'])['number']]
+            body = {
+                'user_id': user_id,
+                'question_id': question['id'],
+                'numbers': numbers,
+            }
+            self.request('save-answer', 'POST', '/tests/save-answer/', body)
+            if random.random() < self.retry_rate:
+                self.request('save-answer', 'POST', '/tests/save-answer/', body)
+
+        query = f'?user_id={user_id}'
+        self.request('user-test', 'GET', f'/tests/{self.test_id}/user-test/{query}')
+        if (
+            self.request('end-test', 'POST', f'/tests/{self.test_id}/end-test/{query}')
+            is not None
+        ):
+            with self.lock:
+                self.completed += 1
+
+    def request(
+        self, endpoint: str, method: str, path: str, body: dict | None = None
+    ) -> dict | None:
+        """Отправляет запрос; возвращает тело успешного ответа."""
+        request = urllib.request.Request(
+            self.base_url + path,
+            method=method,
+            data=json.dumps(body).encode() if body is not None else None,
+            headers={'Content-Type': 'application/json'},
+        )
+        content = b''
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                content = response.read()
+                status = response.status
+        except urllib.error.HTTPError as exc:
+            content = exc.read()
+            status = exc.code
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            status = 'error'
+        elapsed = time.perf_counter() - started
+
+        text = content.decode(errors='replace')
+        with self.lock:
+            self.timings[endpoint].append(elapsed)
+            self.statuses[endpoint][status] += 1
+            if status == 400 and any(marker in text for marker in CONSTRAINT_MARKERS):
+                self.violations[endpoint] += 1
+        if status == 200:
+            return json.loads(content)
+        return None
+
+
+def percentile(sorted_values: list[float], percent: int) -> float:
+    index = round(percent / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
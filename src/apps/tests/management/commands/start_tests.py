@@ -0,0 +1,60 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.transaction import atomic
+
+from apps.tests.serializers.test import StartTestsSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Начало теста заранее для группы пользователей; идентификаторы '
+        'пользователей читаются из файла по одному в строке'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('test_id', type=int)
+        parser.add_argument(
+            'user_ids_file',
+            help='Файл с идентификаторами пользователей (вывод import_users), - для stdin',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество пользователей в одном запросе',
+        )
+
+    def handle(self, *args, **kwargs):
+        user_ids = self.read_user_ids(kwargs['user_ids_file'])
+        started = skipped = 0
+        with atomic():
+            for start in range(0, len(user_ids), kwargs['batch_size']):
+                batch = user_ids[start : start + kwargs['batch_size']]
+                serializer = StartTestsSerializer(
+                    data={'test_id': kwargs['test_id'], 'user_ids': batch}
+                )
+                if not serializer.is_valid():
+                    raise CommandError(
+                        '; '.join(
+                            f'{field}: {" ".join(map(str, messages))}'
+                            for field, messages in serializer.errors.items()
+                        )
+                    )
+                result = serializer.save()
+                started += len(result['attempts'])
+                skipped += len(result['skipped'])
+        self.stdout.write(
+            f'Начато попыток: {started}, пропущено пользователей: {skipped}'
+        )
+
+    def read_user_ids(self, path: str) -> list[int]:
+        if path == '-':
+            lines = sys.stdin.read().split()
+        else:
+            with open(path) as file:
+                lines = file.read().split()
+        invalid = [line for line in lines if not line.isdigit()]
+        if invalid:
+            raise CommandError(f'Некорректный идентификатор пользователя: {invalid[0]}')
+        return [int(line) for line in lines]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='test',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Прежний import_tests объединял вопросы с одинаковым текстом и мог привязать
+# к одному вопросу два набора вариантов. Перед ограничением уникальности
+# остаётся вариант, созданный первым; ответы пользователей хранят номера
+# вариантов, поэтому их не нужно менять.
+DELETE_DUPLICATE_OPTIONS_SQL = """
+DELETE FROM tests_answeroption duplicate
+USING tests_answeroption original
+WHERE duplicate.question_id = original.question_id
+    AND duplicate.number = original.number
+    AND duplicate.id > original.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0004_question_content_hash'),
+        ('users', '0005_alter_useranswer_user'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            DELETE_DUPLICATE_OPTIONS_SQL, reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.AddConstraint(
+            model_name='answeroption',
+            constraint=models.UniqueConstraint(
+                fields=('question', 'number'),
+                include=('is_correct',),
+                name='unique_question_and_number',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='answeroption',
+            name='question',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name='answer_options',
+                to='tests.question',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='testresult',
+            name='user',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to='users.user',
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:27
+
+from django.db import migrations, models
+
+# Время завершения уже завершённых попыток неизвестно, поэтому отсчёт для
+# архивации начинается с момента миграции.
+SET_FINISHED_AT_SQL = """
+UPDATE tests_testresult SET finished_at = now() WHERE status;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0005_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testresult',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunSQL(SET_FINISHED_AT_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='testresult',
+            index=models.Index(
+                condition=models.Q(('status', True)),
+                fields=['finished_at'],
+                name='testresult_finished_at_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Количество секций архива; менять только вместе с пересозданием таблицы.
+PARTITIONS = 8
+
+CREATE_ARCHIVE_SQL = """
+CREATE TABLE tests_archivedattempt (
+    test_id bigint NOT NULL
+        REFERENCES tests_test (id) DEFERRABLE INITIALLY DEFERRED,
+    user_id bigint NOT NULL
+        REFERENCES users_user (id) DEFERRABLE INITIALLY DEFERRED,
+    results smallint NOT NULL CHECK (results >= 0),
+    total_questions integer NOT NULL CHECK (total_questions >= 0),
+    finished_at timestamp with time zone NULL,
+    answers jsonb NOT NULL,
+    PRIMARY KEY (test_id, user_id)
+) PARTITION BY HASH (test_id);
+CREATE INDEX tests_archivedattempt_user_id ON tests_archivedattempt (user_id);
+""" + ''.join(
+    f"""
+CREATE TABLE tests_archivedattempt_{remainder} PARTITION OF tests_archivedattempt
+    FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder});
+"""
+    for remainder in range(PARTITIONS)
+)
+
+DROP_ARCHIVE_SQL = """
+DROP TABLE tests_archivedattempt;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0006_testresult_finished_at'),
+        ('users', '0005_alter_useranswer_user'),
+    ]
+
+    operations = [
+        # Секционированную таблицу Django создать не умеет.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(CREATE_ARCHIVE_SQL, reverse_sql=DROP_ARCHIVE_SQL),
+            ],
+            state_operations=[
+                migrations.CreateModel(
+                    name='ArchivedAttempt',
+                    fields=[
+                        (
+                            'pk',
+                            models.CompositePrimaryKey(
+                                'test',
+                                'user',
+                                blank=True,
+                                editable=False,
+                                primary_key=True,
+                                serialize=False,
+                            ),
+                        ),
+                        (
+                            'test',
+                            models.ForeignKey(
+                                db_index=False,
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name='+',
+                                to='tests.test',
+                            ),
+                        ),
+                        (
+                            'user',
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name='+',
+                                to='users.user',
+                            ),
+                        ),
+                        ('results', models.PositiveSmallIntegerField()),
+                        ('total_questions', models.PositiveIntegerField()),
+                        ('finished_at', models.DateTimeField(null=True)),
+                        ('answers', models.JSONField(default=dict)),
+                    ],
+                ),
+            ],
+        ),
+    ]
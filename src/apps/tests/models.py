@@ -2,8 +2,24 @@ from django.core.validators import MaxValueValidator
 from django.db import models
 
 
+class TestQuerySet(models.QuerySet):
+    def values_for_fields(self, fields: set[str]) -> models.QuerySet:
+        """Строки .values() для выбранных полей списка тестов, кроме вопросов."""
+        queryset = self.order_by('id')
+        if 'questions_count' in fields:
+            queryset = queryset.annotate(questions_count=models.Count('questions'))
+        return queryset.values('id', *sorted({'title', 'questions_count'} & fields))
+
+    def bump_version(self) -> int:
+        """Инвалидирует закэшированные представления тестов."""
+        return self.update(version=models.F('version') + 1)
+
+
 class Test(models.Model):
     title = models.CharField(max_length=128, unique=True)
+    version = models.PositiveIntegerField(default=0)
+
+    objects = TestQuerySet.as_manager()
 
 
 class Question(models.Model):
@@ -16,21 +32,41 @@ class Question(models.Model):
     )
     text = models.CharField(max_length=256)
     question_type = models.CharField(max_length=10, choices=QUESTION_TYPES)
+    content_hash = models.CharField(max_length=64, blank=True, default='')
 
 
 class AnswerOption(models.Model):
+    # Поиск по вопросу обслуживает индекс unique_question_and_number.
     question = models.ForeignKey(
-        'tests.Question', related_name='answer_options', on_delete=models.CASCADE
+        'tests.Question',
+        related_name='answer_options',
+        on_delete=models.CASCADE,
+        db_index=False,
     )
     text = models.CharField(max_length=256)
     number = models.PositiveIntegerField()
     is_correct = models.BooleanField(default=False)
 
+    class Meta:
+        constraints = (
+            # is_correct в индексе позволяет проверять ответы без чтения таблицы.
+            models.UniqueConstraint(
+                fields=[
+                    'question',
+                    'number',
+                ],
+                include=['is_correct'],
+                name='unique_question_and_number',
+            ),
+        )
+
 
 class TestResult(models.Model):
+    # Поиск по пользователю обслуживает индекс unique_user_and_test.
     user = models.ForeignKey(
         'users.User',
         on_delete=models.CASCADE,
+        db_index=False,
     )
     test = models.ForeignKey(
         'tests.Test',
@@ -43,6 +79,7 @@ class TestResult(models.Model):
             MaxValueValidator(1),
         ]
     )
+    finished_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         constraints = (
@@ -54,3 +91,31 @@ class TestResult(models.Model):
                 name='unique_user_and_test',
             ),
         )
+        indexes = (
+            # Выбор завершённых попыток для переноса в архив.
+            models.Index(
+                fields=['finished_at'],
+                condition=models.Q(status=True),
+                name='testresult_finished_at_idx',
+            ),
+        )
+
+
+class ArchivedAttempt(models.Model):
+    """Завершённая попытка, перенесённая в архив командой archive_attempts.
+
+    Таблица секционирована по хешу test_id (см. миграцию 0007), поэтому
+    test_id входит в первичный ключ. Ответы хранятся как
+    {question_id: selected_numbers}.
+    """
+
+    pk = models.CompositePrimaryKey('test', 'user')
+    # Поиск по тесту обслуживает первичный ключ.
+    test = models.ForeignKey(
+        'tests.Test', related_name='+', on_delete=models.CASCADE, db_index=False
+    )
+    user = models.ForeignKey('users.User', related_name='+', on_delete=models.CASCADE)
+    results = models.PositiveSmallIntegerField()
+    total_questions = models.PositiveIntegerField()
+    finished_at = models.DateTimeField(null=True)
+    answers = models.JSONField(default=dict)
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import quote_etag
+
+
+def get_etag(test_id: int, version: int) -> str:
+    return quote_etag(f'test-{test_id}-{version}')
+
+
+def get_cache_key(test_id: int, version: int, format: str) -> str:
+    return f'tests:payload:{test_id}:{version}:{format}'
+
+
+def get_payload(key: str) -> bytes | None:
+    return cache.get(key)
+
+
+def set_payload(key: str, content: bytes) -> None:
+    cache.set(key, content, timeout=settings.TEST_PAYLOAD_CACHE_TIMEOUT)
+
+
+async def aget_payload(key: str) -> bytes | None:
+    return await cache.aget(key)
+
+
+async def aset_payload(key: str, content: bytes) -> None:
+    await cache.aset(key, content, timeout=settings.TEST_PAYLOAD_CACHE_TIMEOUT)
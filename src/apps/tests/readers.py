@@ -0,0 +1,103 @@
+"""Сборка ответов GET эндпоинтов тестов напрямую из строк .values().
+
+Схема ответов совпадает с TestGETSerializer, TestListGETSerializer и
+TestResultGETSerializer, но без создания моделей и сериализаторов на
+каждый вопрос и вариант ответа.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.db.models import QuerySet
+
+from apps.tests.loaders import aload_selected_choices, load_selected_choices
+from apps.tests.models import AnswerOption, Question
+
+LIST_FIELDS = ('id', 'title', 'questions_count', 'questions')
+
+
+def read_questions(test_ids: Iterable[int]) -> dict[int, list[dict]]:
+    """Вопросы с вариантами ответов по тестам за 2 запроса."""
+    questions, answer_options = _questions_querysets(test_ids)
+    return _group_questions(questions, answer_options)
+
+
+async def aread_questions(test_ids: Iterable[int]) -> dict[int, list[dict]]:
+    questions, answer_options = _questions_querysets(test_ids)
+    return _group_questions(
+        [row async for row in questions], [row async for row in answer_options]
+    )
+
+
+def read_test(test: dict) -> dict:
+    questions = read_questions([test['id']])
+    return {**test, 'questions': questions.get(test['id'], [])}
+
+
+async def aread_test(test: dict) -> dict:
+    questions = await aread_questions([test['id']])
+    return {**test, 'questions': questions.get(test['id'], [])}
+
+
+def read_user_test(test: dict, user_id: int | str | None) -> dict:
+    test = read_test(test)
+    _add_selected_choices(test, load_selected_choices(user_id, test['id']))
+    return test
+
+
+async def aread_user_test(test: dict, user_id: int | str | None) -> dict:
+    test = await aread_test(test)
+    _add_selected_choices(test, await aload_selected_choices(user_id, test['id']))
+    return test
+
+
+def read_test_list(tests: list[dict], fields: set[str]) -> list[dict]:
+    """Страница списка тестов с выбранными полями."""
+    questions = {}
+    if 'questions' in fields:
+        questions = read_questions([test['id'] for test in tests])
+
+    return [
+        {
+            field: (
+                questions.get(test['id'], []) if field == 'questions' else test[field]
+            )
+            for field in LIST_FIELDS
+            if field in fields
+        }
+        for test in tests
+    ]
+
+
+def _questions_querysets(test_ids: Iterable[int]) -> tuple[QuerySet, QuerySet]:
+    test_ids = list(test_ids)
+    questions = (
+        Question.objects.filter(test_id__in=test_ids)
+        .order_by('id')
+        .values('id', 'test_id', 'text', 'question_type')
+    )
+    answer_options = (
+        AnswerOption.objects.filter(question__test_id__in=test_ids)
+        .order_by('number')
+        .values('id', 'question_id', 'text', 'number')
+    )
+    return questions, answer_options
+
+
+def _group_questions(
+    questions: Iterable[dict], answer_options: Iterable[dict]
+) -> dict[int, list[dict]]:
+    question_answer_options = defaultdict(list)
+    for answer_option in answer_options:
+        question_answer_options[answer_option.pop('question_id')].append(answer_option)
+
+    test_questions = defaultdict(list)
+    for question in questions:
+        question['answer_options'] = question_answer_options[question['id']]
+        test_questions[question.pop('test_id')].append(question)
+    return test_questions
+
+
+def _add_selected_choices(test: dict, selected_choices: dict[int, list]) -> None:
+    for question in test['questions']:
+        question['selected_choices'] = selected_choices.get(question['id'], [])
@@ -0,0 +1,73 @@
+"""Разбор полей запроса без обращений к БД с сообщениями об ошибках DRF.
+
+Правила разбора совпадают с полями сериализаторов: первичные ключи — как у
+PrimaryKeyRelatedField, номера ответов — ListField(child=IntegerField()).
+"""
+
+from typing import Any
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import Field, IntegerField, ListField, empty
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.serializers import Serializer
+
+# Границы значений первичного ключа BigAutoField.
+MIN_PK = -(2**63)
+MAX_PK = 2**63 - 1
+
+numbers_field = ListField(child=IntegerField())
+
+
+def invalid_data(data: Any) -> dict[str, list[str]]:
+    """Ошибка сериализатора для тела запроса, которое не является объектом."""
+    if data is None:
+        # Сериализатор отдаёт это сообщение без перевода.
+        return {'non_field_errors': ['No data provided']}
+    message = str(Serializer.default_error_messages['invalid']).format(
+        datatype=type(data).__name__
+    )
+    return {'non_field_errors': [message]}
+
+
+def get_pk(data: dict[str, Any], field: str, errors: dict[str, list]) -> int | None:
+    """Первичный ключ; существование объекта проверяет вызывающий код."""
+    value = data.get(field, empty)
+    if value is empty:
+        errors[field] = [str(Field.default_error_messages['required'])]
+        return None
+    # Связанные поля считают пустую строку отсутствующим значением.
+    if value is None or value == '':
+        errors[field] = [str(Field.default_error_messages['null'])]
+        return None
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        pk = int(value)
+    except (TypeError, ValueError):
+        errors[field] = [
+            str(PrimaryKeyRelatedField.default_error_messages['incorrect_type']).format(
+                data_type=type(value).__name__
+            )
+        ]
+        return None
+    if not MIN_PK <= pk <= MAX_PK:
+        errors[field] = does_not_exist(value)
+        return None
+    return pk
+
+
+def does_not_exist(value: Any) -> list[str]:
+    """Ошибка для ключа value из запроса, которому не нашлось объекта."""
+    return [
+        str(PrimaryKeyRelatedField.default_error_messages['does_not_exist']).format(
+            pk_value=value
+        )
+    ]
+
+
+def get_numbers(data: dict[str, Any], errors: dict[str, Any]) -> list[int] | None:
+    try:
+        return numbers_field.run_validation(data.get('numbers', empty))
+    except ValidationError as exc:
+        errors['numbers'] = exc.detail
+        return None
@@ -5,7 +5,6 @@ from apps.tests.serializers.answer import (
     AnswerOptionGETSerializer,
     AnswerResultOptionGETSerializer,
 )
-from apps.users.models import UserAnswer
 
 
 class QuestionGETSerializer(serializers.ModelSerializer):
@@ -30,15 +29,7 @@ class QuestionResultGETSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'question_type', 'answer_options', 'selected_choices')
 
     def get_selected_choices(self, obj: Question):
-        user_id = self.context.get('user_id')
-        if not user_id:
-            return []
-
-        try:
-            user_answer = UserAnswer.objects.get(user_id=user_id, question=obj)
-        except UserAnswer.DoesNotExist:
-            return []
-
-        selected = user_answer.selected_choices.all()
+        selected_choices = self.context.get('selected_choices', {})
+        selected = selected_choices.get(obj.id, [])
         serializer = AnswerResultOptionGETSerializer(selected, many=True)
         return serializer.data
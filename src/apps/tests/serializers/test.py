@@ -1,12 +1,25 @@
 from typing import Any
 
+from django.conf import settings
+from django.db import IntegrityError
 from django.db.models import F
-from drf_spectacular.utils import OpenApiExample, extend_schema_serializer
+from django.db.transaction import atomic
+from drf_spectacular.utils import (
+    OpenApiExample,
+    extend_schema_field,
+    extend_schema_serializer,
+)
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator
 
-from apps.tests.models import AnswerOption, Question, Test, TestResult
+from apps.tests import grading
+from apps.tests.answer_buffer import answer_buffer
+from apps.tests.answer_keys import answer_keys
+from apps.tests.attempts import start_tests
+from apps.tests.models import ArchivedAttempt, Question, Test, TestResult
 from apps.tests.serializers.question import (
     QuestionGETSerializer,
     QuestionResultGETSerializer,
@@ -14,6 +27,20 @@ from apps.tests.serializers.question import (
 from apps.users.models import User, UserAnswer
 
 
+def unique_answer_error() -> ValidationError:
+    """Ошибка повторного ответа с тем же сообщением, что у save-answer."""
+    return ValidationError(
+        {
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                str(UniqueTogetherValidator.message).format(
+                    field_names='user_id, question_id'
+                )
+            ]
+        },
+        code='unique',
+    )
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
@@ -84,6 +111,34 @@ class TestGETSerializer(serializers.ModelSerializer):
         fields = ('id', 'title', 'questions')
 
 
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            'Valid example response',
+            value={
+                'count': 1,
+                'next': None,
+                'previous': None,
+                'results': [{'id': 1, 'title': 'Мой тест', 'questions_count': 2}],
+            },
+            response_only=True,
+        ),
+    ]
+)
+class TestListGETSerializer(serializers.ModelSerializer):
+    """Тест в списке: поля выбираются параметрами fields и expand."""
+
+    summary_fields = ('id', 'title', 'questions_count')
+    expandable_fields = ('questions',)
+
+    questions_count = serializers.IntegerField(read_only=True)
+    questions = QuestionGETSerializer(read_only=True, many=True)
+
+    class Meta:
+        model = Test
+        fields = ('id', 'title', 'questions_count', 'questions')
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
@@ -151,12 +206,97 @@ class StartTestSerializer(serializers.ModelSerializer):
         model = TestResult
         fields = ('id', 'user_id', 'test_id', 'total_questions', 'status', 'results')
 
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        # Попытка, перенесённая в архив, тоже считается пройденной.
+        if ArchivedAttempt.objects.filter(
+            user=attrs['user'], test=attrs['test']
+        ).exists():
+            raise ValidationError(
+                str(UniqueTogetherValidator.message).format(
+                    field_names='user_id, test_id'
+                ),
+                code='unique',
+            )
+        return attrs
+
     def create(self, validated_data: dict[str, Any]) -> TestResult:
         test = validated_data['test']
         validated_data['total_questions'] = test.questions.count()
         return super().create(validated_data)
 
 
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            'Valid example response',
+            value={
+                'test_id': 1,
+                'attempts': [
+                    {
+                        'id': 1,
+                        'user_id': 1,
+                        'test_id': 1,
+                        'total_questions': 10,
+                        'status': False,
+                        'results': 0,
+                    },
+                ],
+                'skipped': [2],
+            },
+            response_only=True,
+        ),
+        OpenApiExample(
+            name='Valid example request',
+            value={
+                'test_id': 1,
+                'user_ids': [1, 2],
+            },
+            request_only=True,
+        ),
+    ]
+)
+class StartTestsSerializer(serializers.Serializer):
+    test_id = PrimaryKeyRelatedField(
+        queryset=Test.objects.all(),
+        required=True,
+        source='test',
+    )
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.START_TESTS_MAX_SIZE,
+        write_only=True,
+    )
+    attempts = StartTestSerializer(many=True, read_only=True)
+    skipped = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+
+    def validate_user_ids(self, user_ids: list[int]) -> list[int]:
+        user_ids = list(dict.fromkeys(user_ids))
+        existing = set(
+            User.objects.filter(pk__in=user_ids).values_list('id', flat=True)
+        )
+        missing = [user_id for user_id in user_ids if user_id not in existing]
+        if missing:
+            raise ValidationError(
+                f'Пользователи не найдены: {", ".join(map(str, missing))}.'
+            )
+        return user_ids
+
+    def create(self, validated_data: dict[str, Any]) -> dict[str, Any]:
+        attempts = start_tests(validated_data['test'].id, validated_data['user_ids'])
+        started = {attempt.user_id for attempt in attempts}
+        return {
+            'test': validated_data['test'],
+            'attempts': attempts,
+            # Уже начатые или перенесённые в архив попытки.
+            'skipped': [
+                user_id
+                for user_id in validated_data['user_ids']
+                if user_id not in started
+            ],
+        }
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
@@ -196,7 +336,7 @@ class SaveAnswerTestSerializer(serializers.ModelSerializer):
         required=True,
         write_only=True,
     )
-    selected_choices = PrimaryKeyRelatedField(many=True, read_only=True)
+    selected_choices = serializers.SerializerMethodField()
 
     class Meta:
         model = UserAnswer
@@ -208,47 +348,211 @@ class SaveAnswerTestSerializer(serializers.ModelSerializer):
             'selected_choices',
         )
 
+    def get_validators(self) -> list:
+        # При отложенном подсчёте баллов повторный ответ заменяет предыдущий.
+        if grading.is_deferred():
+            return []
+        return super().get_validators()
+
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
         user = attrs['user']
         question = attrs['question']
-        test = question.test
+        answer_key = answer_keys.get(question.id)
         answer_numbers = attrs['numbers']
 
-        if not TestResult.objects.filter(user=user, test=test).exists():
+        if not TestResult.objects.filter(
+            user=user, test_id=answer_key.test_id
+        ).exists():
             raise ValidationError('Пользователь не начал этот тест.')
 
-        valid_numbers = set(
-            AnswerOption.objects.filter(question_id=question.id).values_list(
-                'number', flat=True
-            )
-        )
-        if not set(answer_numbers).issubset(valid_numbers):
+        if not answer_key.is_valid(answer_numbers):
             raise ValidationError('Некорректные номера ответов.')
 
         return attrs
 
+    def buffer(self) -> dict[str, Any]:
+        """Записывает ответ в журнал отложенной записи вместо БД."""
+        question = self.validated_data['question']
+        user = self.validated_data['user']
+        answer_key = answer_keys.get(question.id)
+        answer_numbers = answer_key.get_numbers(self.validated_data['numbers'])
+
+        if not answer_buffer.append(
+            user.id,
+            answer_key.test_id,
+            question.id,
+            answer_numbers,
+            unique=not grading.is_deferred(),
+        ):
+            raise unique_answer_error()
+        return {
+            'id': None,
+            'user_id': user.id,
+            'question_id': question.id,
+            'selected_choices': answer_key.get_option_ids(answer_numbers),
+        }
+
     def create(self, validated_data: dict[str, Any]) -> UserAnswer:
         question = validated_data['question']
         user = validated_data['user']
+        answer_key = answer_keys.get(question.id)
         answer_numbers = validated_data['numbers']
+        user_answer = UserAnswer(
+            user=user,
+            question=question,
+            selected_numbers=answer_key.get_numbers(answer_numbers),
+        )
 
-        answer_options = AnswerOption.objects.filter(
-            question=question, number__in=answer_numbers
-        ).values('id', 'is_correct')
+        if grading.is_deferred():
+            (user_answer,) = UserAnswer.objects.upsert([user_answer])
+            return user_answer
 
-        if all(answer_option['is_correct'] for answer_option in answer_options):
-            TestResult.objects.filter(user=user, test=question.test).update(
+        if answer_key.is_correct(answer_numbers):
+            TestResult.objects.filter(user=user, test_id=answer_key.test_id).update(
                 results=F('results') + 1
             )
+        user_answer.save()
+        return user_answer
 
-        user_answer = UserAnswer.objects.create(
-            user=user,
-            question=question,
-        )
-        user_answer.selected_choices.set(
-            [answer_option['id'] for answer_option in answer_options]
+    @extend_schema_field(serializers.ListField(child=serializers.IntegerField()))
+    def get_selected_choices(self, obj: UserAnswer) -> list[int]:
+        return answer_keys.get(obj.question_id).get_option_ids(obj.selected_numbers)
+
+
+class AnswerSerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    question_id = serializers.IntegerField(required=True)
+    numbers = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=True,
+        write_only=True,
+    )
+    selected_choices = serializers.ListField(
+        child=serializers.IntegerField(),
+        read_only=True,
+    )
+
+
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            'Valid example response',
+            value={
+                'user_id': 1,
+                'test_id': 1,
+                'answers': [
+                    {'id': 1, 'question_id': 1, 'selected_choices': [1]},
+                    {'id': 2, 'question_id': 12, 'selected_choices': [5, 7]},
+                ],
+            },
+            response_only=True,
+        ),
+        OpenApiExample(
+            name='Valid example request',
+            value={
+                'user_id': 1,
+                'test_id': 1,
+                'answers': [
+                    {'question_id': 1, 'numbers': [0]},
+                    {'question_id': 12, 'numbers': [0, 2]},
+                ],
+            },
+            request_only=True,
+        ),
+    ]
+)
+class SaveAnswersTestSerializer(serializers.Serializer):
+    user_id = PrimaryKeyRelatedField(
+        queryset=User.objects.all(),
+        required=True,
+        source='user',
+    )
+    test_id = PrimaryKeyRelatedField(
+        queryset=Test.objects.all(),
+        required=True,
+        source='test',
+    )
+    answers = AnswerSerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        user = attrs['user']
+        test = attrs['test']
+        answers = attrs['answers']
+        question_ids = [answer['question_id'] for answer in answers]
+
+        if len(set(question_ids)) != len(question_ids):
+            raise ValidationError('Повторяющиеся вопросы в ответах.')
+
+        if not TestResult.objects.filter(user=user, test=test).exists():
+            raise ValidationError('Пользователь не начал этот тест.')
+
+        answer_keys_map = answer_keys.get_many(question_ids)
+        for answer in answers:
+            answer_key = answer_keys_map.get(answer['question_id'])
+            if answer_key is None or answer_key.test_id != test.id:
+                raise ValidationError('Вопрос не относится к этому тесту.')
+            if not answer_key.is_valid(answer['numbers']):
+                raise ValidationError('Некорректные номера ответов.')
+
+        if (
+            not grading.is_deferred()
+            and UserAnswer.objects.filter(
+                user=user, question_id__in=question_ids
+            ).exists()
+        ):
+            raise unique_answer_error()
+
+        return attrs
+
+    def create(self, validated_data: dict[str, Any]) -> dict[str, Any]:
+        user = validated_data['user']
+        test = validated_data['test']
+        answers = validated_data['answers']
+        answer_keys_map = answer_keys.get_many(
+            answer['question_id'] for answer in answers
         )
-        return user_answer
+
+        results = 0
+        user_answers = []
+        selected_choices = []
+        for answer in answers:
+            answer_key = answer_keys_map[answer['question_id']]
+            results += answer_key.is_correct(answer['numbers'])
+            user_answers.append(
+                UserAnswer(
+                    user=user,
+                    question_id=answer['question_id'],
+                    selected_numbers=answer_key.get_numbers(answer['numbers']),
+                )
+            )
+            selected_choices.append(answer_key.get_option_ids(answer['numbers']))
+        if grading.is_deferred():
+            user_answers = UserAnswer.objects.upsert(user_answers)
+        else:
+            # Ответ мог быть сохранён параллельным запросом после проверки.
+            try:
+                with atomic():
+                    UserAnswer.objects.bulk_create(user_answers)
+            except IntegrityError:
+                raise unique_answer_error()
+
+        if results and not grading.is_deferred():
+            TestResult.objects.filter(user=user, test=test).update(
+                results=F('results') + results
+            )
+
+        return {
+            'user': user,
+            'test': test,
+            'answers': [
+                {
+                    'id': user_answer.id,
+                    'question_id': user_answer.question_id,
+                    'selected_choices': option_ids,
+                }
+                for user_answer, option_ids in zip(user_answers, selected_choices)
+            ],
+        }
 
 
 @extend_schema_serializer(
@@ -0,0 +1,29 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.tests.models import AnswerOption, Question, Test
+
+
+@receiver(pre_save, sender=Test)
+def bump_test_version(instance: Test, **kwargs) -> None:
+    # Увеличение в самом UPDATE: экземпляр мог быть загружен до того, как
+    # изменение вопросов увеличило версию в БД.
+    if not instance._state.adding:
+        instance.version = F('version') + 1
+
+
+@receiver(post_save, sender=Test)
+def refresh_test_version(instance: Test, created: bool, **kwargs) -> None:
+    if not created:
+        instance.refresh_from_db(fields=['version'])
+
+
+@receiver([post_save, post_delete], sender=Question)
+def bump_question_test_version(instance: Question, **kwargs) -> None:
+    Test.objects.filter(pk=instance.test_id).bump_version()
+
+
+@receiver([post_save, post_delete], sender=AnswerOption)
+def bump_answer_option_test_version(instance: AnswerOption, **kwargs) -> None:
+    Test.objects.filter(questions=instance.question_id).bump_version()
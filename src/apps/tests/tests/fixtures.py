@@ -0,0 +1,43 @@
+from django.db.models import Prefetch, QuerySet
+
+from apps.tests.models import AnswerOption, Question, Test
+from apps.users.models import User
+
+
+def create_test(title: str, questions: int = 3, options: int = 3) -> Test:
+    """Тест с вопросами, у каждого из которых первый вариант ответа верный."""
+    test = Test.objects.create(title=title)
+    for index in range(questions):
+        question = Question.objects.create(
+            test=test,
+            text=f'Вопрос {index}',
+            question_type='multiple' if index % 2 else 'single',
+        )
+        AnswerOption.objects.bulk_create(
+            AnswerOption(
+                question=question,
+                text=f'Вариант {number}',
+                number=number,
+                is_correct=number == 0,
+            )
+            for number in range(options)
+        )
+    return test
+
+
+def create_user() -> User:
+    return User.objects.create(first_name='first_name', last_name='last_name')
+
+
+def prefetch_questions(queryset: QuerySet) -> QuerySet:
+    """Тесты для сериализаторов с вопросами и вариантами в порядке readers."""
+    return queryset.prefetch_related(
+        Prefetch(
+            'questions',
+            queryset=Question.objects.order_by('id').prefetch_related(
+                Prefetch(
+                    'answer_options', queryset=AnswerOption.objects.order_by('number')
+                )
+            ),
+        )
+    ).order_by('id')
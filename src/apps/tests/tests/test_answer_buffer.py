@@ -0,0 +1,122 @@
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from apps.tests.answer_buffer import AnswerBuffer, answer_buffer
+from apps.tests.models import TestResult
+from apps.tests.tests.fixtures import create_test, create_user
+from apps.users.models import UserAnswer
+
+
+class AnswerBufferTests(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.buffer = AnswerBuffer(directory.name, fsync=False)
+        self.test = create_test('Тест', questions=3)
+        self.questions = list(self.test.questions.order_by('id'))
+        self.user = create_user()
+        TestResult.objects.create(user=self.user, test=self.test, total_questions=3)
+        self.path = self.buffer.get_path(self.user.pk, self.test.pk)
+
+    def append(self, question_index: int, **kwargs) -> bool:
+        return self.buffer.append(
+            self.user.pk,
+            self.test.pk,
+            self.questions[question_index].pk,
+            [0],
+            **kwargs,
+        )
+
+    def saved_questions(self) -> set[int]:
+        return set(
+            UserAnswer.objects.filter(user=self.user).values_list(
+                'question_id', flat=True
+            )
+        )
+
+    def test_torn_tail_is_truncated_on_append(self) -> None:
+        self.append(0)
+        with open(self.path, 'ab') as file:
+            file.write(b'{"user_id": 1, "te')
+        self.append(1)
+
+        self.assertEqual(self.buffer.flush_attempt(self.user.pk, self.test.pk), 2)
+        self.assertEqual(
+            self.saved_questions(), {self.questions[0].pk, self.questions[1].pk}
+        )
+
+    def test_corrupted_line_is_skipped(self) -> None:
+        self.append(0)
+        with open(self.path, 'ab') as file:
+            file.write(b'{"user_id": 1, "te{"user_id": 1}\n')
+        self.append(1)
+
+        with self.assertLogs('apps.tests.answer_buffer', level='WARNING'):
+            self.assertEqual(self.buffer.flush(batch_size=10), 2)
+        self.assertFalse(self.path.exists())
+
+    def test_unique_append_is_atomic(self) -> None:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(lambda _: self.append(0, unique=True), range(32))
+            )
+        self.assertEqual(results.count(True), 1)
+        self.assertTrue(self.append(1, unique=True))
+
+
+@override_settings(ANSWER_BUFFER_ENABLED=True)
+class BufferedSaveAnswerTests(APITestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.object(answer_buffer, 'directory', Path(directory.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.test = create_test('Тест', questions=1)
+        self.question = self.test.questions.get()
+        self.user = create_user()
+        TestResult.objects.create(user=self.user, test=self.test, total_questions=1)
+        self.data = {
+            'user_id': self.user.pk,
+            'question_id': self.question.pk,
+            'numbers': [0],
+        }
+
+    def test_append_outside_transaction(self) -> None:
+        atomic_blocks = len(connection.atomic_blocks)
+        append = answer_buffer.append
+
+        def check_append(*args, **kwargs) -> bool:
+            self.assertEqual(len(connection.atomic_blocks), atomic_blocks)
+            return append(*args, **kwargs)
+
+        with mock.patch.object(answer_buffer, 'append', side_effect=check_append):
+            response = self.client.post('/tests/save-answer/', self.data, format='json')
+
+        self.assertEqual(response.status_code, 202)
+
+    def test_duplicate_answer(self) -> None:
+        for url in ('/tests/save-answer/', '/async/tests/save-answer/'):
+            with self.subTest(url=url):
+                answer_buffer.flush_attempt(self.user.pk, self.test.pk)
+                UserAnswer.objects.all().delete()
+                self.assertEqual(
+                    self.client.post(url, self.data, format='json').status_code, 202
+                )
+                response = self.client.post(url, self.data, format='json')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(
+                    response.json(),
+                    {
+                        'non_field_errors': [
+                            'Поля user_id, question_id должны производить массив '
+                            'с уникальными значениями.'
+                        ]
+                    },
+                )
@@ -0,0 +1,90 @@
+from django.test import TestCase
+
+from apps.tests.answer_keys import AnswerKeyCache
+from apps.tests.models import AnswerOption, Question
+from apps.tests.tests.fixtures import create_test
+
+
+class AnswerKeyCacheTests(TestCase):
+    """Каждый экземпляр кэша ведёт себя как отдельный процесс."""
+
+    def setUp(self) -> None:
+        self.test = create_test('Тест', questions=1)
+        self.question = self.test.questions.get()
+        self.answer_keys = AnswerKeyCache(maxsize=10)
+
+    def test_cached_key_is_checked_with_one_query(self) -> None:
+        with self.assertNumQueries(1):
+            answer_key = self.answer_keys.get(self.question.pk)
+        with self.assertNumQueries(1):
+            self.assertIs(self.answer_keys.get(self.question.pk), answer_key)
+        self.assertEqual(answer_key.correct_numbers, {0})
+
+    def assertReloaded(self, answer_keys: AnswerKeyCache, stale) -> None:
+        """Устаревший ключ загружается заново, затем снова проверяется одним запросом."""
+        with self.assertNumQueries(2):
+            answer_key = answer_keys.get(self.question.pk)
+        self.assertIsNot(answer_key, stale)
+        with self.assertNumQueries(1):
+            self.assertIs(answer_keys.get(self.question.pk), answer_key)
+
+    def test_change_in_another_process(self) -> None:
+        stale = self.answer_keys.get(self.question.pk)
+        other = AnswerKeyCache(maxsize=10)
+        other.get(self.question.pk)
+
+        option = AnswerOption.objects.get(question=self.question, number=1)
+        option.is_correct = True
+        option.save()
+
+        self.assertReloaded(self.answer_keys, stale)
+        self.assertEqual(self.answer_keys.get(self.question.pk).correct_numbers, {0, 1})
+        self.assertEqual(other.get(self.question.pk).correct_numbers, {0, 1})
+
+    def test_option_changed_by_another_process(self) -> None:
+        """Другой процесс уже загрузил ключ после изменения, этот — нет."""
+        stale = self.answer_keys.get(self.question.pk)
+        other = AnswerKeyCache(maxsize=10)
+
+        option = AnswerOption.objects.get(question=self.question, number=0)
+        option.is_correct = False
+        option.save()
+        self.assertEqual(other.get(self.question.pk).correct_numbers, set())
+        AnswerOption.objects.create(
+            question=self.question, text='Вариант 3', number=3, is_correct=True
+        )
+        self.assertEqual(other.get(self.question.pk).correct_numbers, {3})
+
+        self.assertReloaded(self.answer_keys, stale)
+        answer_key = self.answer_keys.get(self.question.pk)
+        self.assertEqual(answer_key, other.get(self.question.pk))
+        self.assertEqual(answer_key.valid_numbers, {0, 1, 2, 3})
+        self.assertEqual(answer_key.correct_numbers, {3})
+
+    def test_question_changed_by_another_process(self) -> None:
+        stale = self.answer_keys.get(self.question.pk)
+        other_test = create_test('Другой тест', questions=0)
+
+        self.question.test = other_test
+        self.question.save()
+
+        self.assertReloaded(self.answer_keys, stale)
+        self.assertEqual(self.answer_keys.get(self.question.pk).test_id, other_test.pk)
+
+    def test_deleted_question(self) -> None:
+        self.answer_keys.get(self.question.pk)
+        self.question.delete()
+        self.assertIsNone(self.answer_keys.get(self.question.pk))
+
+    def test_moved_question(self) -> None:
+        self.answer_keys.get(self.question.pk)
+        other_test = create_test('Другой тест', questions=0)
+        Question.objects.filter(pk=self.question.pk).update(test=other_test)
+        self.assertEqual(self.answer_keys.get(self.question.pk).test_id, other_test.pk)
+
+    async def test_aget_many(self) -> None:
+        answer_keys = await self.answer_keys.aget_many([self.question.pk])
+        self.assertEqual(answer_keys[self.question.pk].test_id, self.test.pk)
+        self.assertEqual(
+            await self.answer_keys.aget(self.question.pk), answer_keys[self.question.pk]
+        )
@@ -0,0 +1,115 @@
+import csv
+import io
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.tests.models import ArchivedAttempt, TestResult
+from apps.tests.tests.fixtures import create_test, create_user
+from apps.users.models import UserAnswer
+
+
+class ArchiveAttemptsTests(APITestCase):
+    def setUp(self) -> None:
+        self.test = create_test('Тест', questions=3)
+        self.questions = list(self.test.questions.order_by('id'))
+        now = timezone.now()
+        # Старая, недавняя и незавершённая попытки.
+        self.old_user, self.recent_user, self.active_user = (
+            create_user() for _ in range(3)
+        )
+        for user, status, finished_at in (
+            (self.old_user, True, now - timedelta(days=40)),
+            (self.recent_user, True, now - timedelta(days=10)),
+            (self.active_user, False, None),
+        ):
+            TestResult.objects.create(
+                user=user,
+                test=self.test,
+                total_questions=3,
+                status=status,
+                results=1,
+                finished_at=finished_at,
+            )
+            UserAnswer.objects.bulk_create(
+                UserAnswer(user=user, question=question, selected_numbers=numbers)
+                for question, numbers in zip(self.questions, ([0], [0, 1]))
+            )
+
+    def archive(self) -> str:
+        stdout = StringIO()
+        call_command('archive_attempts', days=30, chunk_size=1, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_command(self) -> None:
+        self.assertIn('Перенесено в архив попыток: 1', self.archive())
+
+        archived = ArchivedAttempt.objects.get()
+        self.assertEqual(archived.user_id, self.old_user.pk)
+        self.assertEqual((archived.results, archived.total_questions), (1, 3))
+        self.assertEqual(
+            archived.answers,
+            {str(self.questions[0].pk): [0], str(self.questions[1].pk): [0, 1]},
+        )
+        self.assertFalse(TestResult.objects.filter(user=self.old_user).exists())
+        self.assertFalse(UserAnswer.objects.filter(user=self.old_user).exists())
+        self.assertEqual(
+            set(TestResult.objects.values_list('user_id', flat=True)),
+            {self.recent_user.pk, self.active_user.pk},
+        )
+        self.assertEqual(UserAnswer.objects.count(), 4)
+        # Повторный запуск ничего не переносит.
+        self.assertIn('Перенесено в архив попыток: 0', self.archive())
+
+    def test_user_test(self) -> None:
+        url = f'/tests/{self.test.pk}/user-test/?user_id={self.old_user.pk}'
+        expected = self.client.get(url).json()
+        self.archive()
+
+        self.assertEqual(self.client.get(url).json(), expected)
+        self.assertEqual(self.client.get(f'/async{url}').json(), expected)
+        self.assertEqual(
+            [question['selected_choices'] != [] for question in expected['questions']],
+            [True, True, False],
+        )
+
+    def test_end_test(self) -> None:
+        self.archive()
+
+        for url in (
+            f'/tests/{self.test.pk}/end-test/?user_id={self.old_user.pk}',
+            f'/async/tests/{self.test.pk}/end-test/?user_id={self.old_user.pk}',
+        ):
+            response = self.client.post(url)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), ['Тест уже завершён!'])
+
+    def test_export(self) -> None:
+        self.archive()
+
+        attempts = self.export('attempts')
+        self.assertEqual(
+            [(row['user_id'], row['archived']) for row in attempts],
+            [
+                (str(self.recent_user.pk), 'False'),
+                (str(self.active_user.pk), 'False'),
+                (str(self.old_user.pk), 'True'),
+            ],
+        )
+        answers = self.export('answers')
+        self.assertEqual(
+            [
+                (row['question_id'], row['selected_numbers'])
+                for row in answers
+                if row['user_id'] == str(self.old_user.pk)
+            ],
+            [(str(self.questions[0].pk), '0'), (str(self.questions[1].pk), '0 1')],
+        )
+
+    def export(self, rows: str) -> list[dict]:
+        response = self.client.get(f'/tests/{self.test.pk}/export/?rows={rows}')
+        content = b''.join(response.streaming_content).decode()
+        return list(csv.DictReader(io.StringIO(content)))
@@ -0,0 +1,44 @@
+import warnings
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+
+from apps.tests import exports
+from apps.tests.models import TestResult
+from apps.tests.tests.fixtures import create_test, create_user
+from apps.users.models import UserAnswer
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class ExportTests(TestCase):
+    def setUp(self) -> None:
+        self.test = create_test('Тест', questions=3)
+        for _ in range(5):
+            user = create_user()
+            TestResult.objects.create(user=user, test=self.test, total_questions=3)
+            UserAnswer.objects.bulk_create(
+                UserAnswer(user=user, question=question, selected_numbers=[0])
+                for question in self.test.questions.all()
+            )
+        self.url = f'/tests/{self.test.pk}/export/?rows=answers'
+
+    def test_wsgi(self) -> None:
+        response = self.client.get(self.url)
+        self.assertFalse(response.is_async)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'user_id,question_id,selected_numbers,is_correct')
+        self.assertEqual(len(lines), 1 + 5 * 3)
+
+    async def test_asgi(self) -> None:
+        expected = await sync_to_async(self.get_content)()
+        response = await self.async_client.get(self.url)
+        # Синхронный итератор Django собрал бы целиком с предупреждением.
+        self.assertTrue(response.is_async)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            parts = [part async for part in response]
+        self.assertGreater(len(parts), 1)
+        self.assertEqual(b''.join(parts), expected)
+
+    def get_content(self) -> bytes:
+        return b''.join(exports.stream(self.test.pk, 'answers', 'csv'))
@@ -0,0 +1,103 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.tests.models import AnswerOption, Question, TestResult
+from apps.tests.tests.fixtures import create_test, create_user
+from apps.users.models import UserAnswer
+
+SAVE_ANSWER_URLS = ('/tests/save-answer/', '/async/tests/save-answer/')
+
+
+class GradingTests(APITestCase):
+    def setUp(self) -> None:
+        self.test = create_test('Тест', questions=2)
+        # Вопрос с двумя верными вариантами: 0 и 2.
+        question = Question.objects.create(
+            test=self.test, text='Вопрос 2', question_type='multiple'
+        )
+        AnswerOption.objects.bulk_create(
+            AnswerOption(
+                question=question,
+                text=f'Вариант {number}',
+                number=number,
+                is_correct=number in (0, 2),
+            )
+            for number in range(4)
+        )
+        self.questions = list(self.test.questions.order_by('id'))
+
+    def start_test(self):
+        user = create_user()
+        TestResult.objects.create(user=user, test=self.test, total_questions=3)
+        return user
+
+    def save_answer(self, user, question: Question, numbers: list[int], url=None):
+        response = self.client.post(
+            url or SAVE_ANSWER_URLS[0],
+            {'user_id': user.pk, 'question_id': question.pk, 'numbers': numbers},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def end_test(self, user) -> int:
+        response = self.client.post(
+            f'/tests/{self.test.pk}/end-test/?user_id={user.pk}'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    @override_settings(GRADING_MODE='deferred')
+    def test_resubmission_replaces_answer(self) -> None:
+        for url in SAVE_ANSWER_URLS:
+            with self.subTest(url=url):
+                user = self.start_test()
+                first = self.save_answer(user, self.questions[2], [1], url)
+                second = self.save_answer(user, self.questions[2], [2, 0], url)
+
+                self.assertEqual(first.json()['id'], second.json()['id'])
+                self.assertEqual(
+                    list(
+                        UserAnswer.objects.filter(user=user).values_list(
+                            'selected_numbers', flat=True
+                        )
+                    ),
+                    [[0, 2]],
+                )
+
+    @override_settings(GRADING_MODE='deferred')
+    def test_save_answer_keeps_results(self) -> None:
+        for url in SAVE_ANSWER_URLS:
+            with self.subTest(url=url):
+                user = self.start_test()
+                self.save_answer(user, self.questions[0], [0], url)
+                self.save_answer(user, self.questions[2], [0, 2], url)
+
+                self.assertEqual(TestResult.objects.get(user=user).results, 0)
+
+    def test_same_score_as_immediate(self) -> None:
+        q0, q1, q2 = self.questions
+        cases = [
+            # Верный, пустой и неверный ответы на вопросы с одним верным вариантом.
+            [(q0, [0]), (q1, []), (q2, [1])],
+            # Подмножество верных вариантов и пустой выбор.
+            [(q0, []), (q1, [1]), (q2, [2])],
+            # Все верные варианты и надмножество верных вариантов.
+            [(q0, [1]), (q1, [0, 1]), (q2, [0, 2])],
+            [(q0, [0]), (q1, [0]), (q2, [0, 1, 2])],
+        ]
+        for answers in cases:
+            with self.subTest(answers=answers):
+                scores = []
+                for mode in ('immediate', 'deferred'):
+                    with self.settings(GRADING_MODE=mode):
+                        user = self.start_test()
+                        for question, numbers in answers:
+                            self.save_answer(user, question, numbers)
+                        scores.append(self.end_test(user))
+                immediate, deferred = scores
+                self.assertEqual(deferred, immediate)
+        self.assertEqual(
+            list(TestResult.objects.order_by('id').values_list('results', flat=True)),
+            [2, 2, 2, 2, 1, 1, 2, 2],
+        )
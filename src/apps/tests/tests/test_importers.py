@@ -0,0 +1,187 @@
+import csv
+import tempfile
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from apps.tests.importers import CopyLoader, OrmLoader, read_rows
+from apps.tests.models import AnswerOption, Question, Test, TestResult
+from apps.tests.tests.fixtures import create_user
+from apps.users.models import UserAnswer
+
+COLUMNS = ('test_title', 'question_text', 'question_type', 'choices', 'correct_answers')
+
+ROWS = [
+    ('Тест', 'Столица Франции?', 'single', 'Париж, Лион', '0'),
+    ('Тест', 'Простые числа', 'multiple', '2, 4, 5', '0, 2'),
+    # Вопросы с одинаковым текстом остаются разными вопросами.
+    ('Тест', 'Повтор', 'single', 'А, Б', '0'),
+    ('Тест', 'Повтор', 'single', 'В, Г', '1'),
+]
+
+
+class IncrementalImportTests(TestCase):
+    def import_tests(self, rows: list[tuple], *args: str) -> str:
+        stdout = StringIO()
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as file:
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            writer.writerows(rows)
+            file.flush()
+            call_command(
+                'import_tests', file.name, '--incremental', *args, stdout=stdout
+            )
+        return stdout.getvalue()
+
+    def get_questions(self) -> list[tuple]:
+        return [
+            (
+                question.pk,
+                question.text,
+                [
+                    (option.pk, option.text, option.is_correct)
+                    for option in question.answer_options.order_by('number')
+                ],
+            )
+            for question in Question.objects.order_by('id')
+        ]
+
+    def test_reimport_is_noop(self) -> None:
+        self.import_tests(ROWS)
+        questions = self.get_questions()
+        version = Test.objects.get().version
+
+        output = self.import_tests(ROWS)
+
+        self.assertIn(
+            'Добавлено: 0, обновлено: 0, удалено: 0, без изменений: 4', output
+        )
+        self.assertEqual(self.get_questions(), questions)
+        self.assertEqual(Test.objects.get().version, version)
+
+    def test_duplicate_texts(self) -> None:
+        self.import_tests(ROWS)
+
+        duplicates = [
+            [text for _, text, _ in options]
+            for _, text, options in self.get_questions()
+            if text == 'Повтор'
+        ]
+        self.assertEqual(duplicates, [['А', 'Б'], ['В', 'Г']])
+
+    def test_option_edit_updates_in_place(self) -> None:
+        self.import_tests(ROWS)
+        (question_id, _, options), *_ = self.get_questions()
+        rows = [
+            ('Тест', 'Столица Франции?', 'single', 'Париж, Марсель', '0'),
+            *ROWS[1:],
+        ]
+
+        output = self.import_tests(rows)
+
+        self.assertIn(
+            'Добавлено: 0, обновлено: 1, удалено: 0, без изменений: 3', output
+        )
+        self.assertEqual(
+            self.get_questions()[0],
+            (
+                question_id,
+                'Столица Франции?',
+                [options[0], (options[1][0], 'Марсель', False)],
+            ),
+        )
+
+    def test_removed_question(self) -> None:
+        self.import_tests(ROWS)
+        user = create_user()
+        TestResult.objects.create(user=user, test=Test.objects.get(), total_questions=4)
+
+        output = self.import_tests(ROWS[:3])
+
+        self.assertIn('удалено: 1', output)
+        self.assertEqual(Question.objects.count(), 3)
+        self.assertEqual(AnswerOption.objects.count(), 7)
+        self.assertEqual(TestResult.objects.get().total_questions, 3)
+
+        # Добавленный вопрос тоже учитывается в попытке.
+        self.import_tests(ROWS)
+        self.assertEqual(TestResult.objects.get().total_questions, 4)
+
+    def test_removed_answered_question(self) -> None:
+        self.import_tests(ROWS)
+        questions = self.get_questions()
+        user = create_user()
+        TestResult.objects.create(user=user, test=Test.objects.get(), total_questions=4)
+        UserAnswer.objects.create(
+            user=user, question_id=questions[3][0], selected_numbers=[1]
+        )
+
+        with self.assertRaisesMessage(CommandError, str(questions[3][0])):
+            self.import_tests(ROWS[:3])
+
+        self.assertEqual(self.get_questions(), questions)
+        self.assertEqual(UserAnswer.objects.count(), 1)
+        self.assertEqual(TestResult.objects.get().total_questions, 4)
+
+    def test_copy_backend_rejected(self) -> None:
+        with self.assertRaises(CommandError):
+            self.import_tests(ROWS, '--backend', 'copy')
+        self.assertFalse(Question.objects.exists())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'COPY доступен только для PostgreSQL')
+class LoadersTests(TestCase):
+    """OrmLoader и CopyLoader сохраняют одинаковые строки."""
+
+    def setUp(self) -> None:
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as file:
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            writer.writerows(
+                [
+                    *ROWS,
+                    ('Второй тест', 'Кавычки "и", запятые', 'single', 'Да, Нет', '1'),
+                    ('Второй тест', 'Обратная \\ косая', 'multiple', 'a, b, c', '1, 2'),
+                ]
+            )
+            file.flush()
+            self.rows = list(read_rows(file.name))
+
+    def get_rows(self) -> tuple[list, list, list]:
+        return (
+            list(Test.objects.order_by('title').values_list('title')),
+            list(
+                Question.objects.order_by('id').values_list(
+                    'test__title', 'text', 'question_type', 'content_hash'
+                )
+            ),
+            list(
+                AnswerOption.objects.order_by('question_id', 'number').values_list(
+                    'question__text', 'number', 'text', 'is_correct'
+                )
+            ),
+        )
+
+    def test_same_rows(self) -> None:
+        OrmLoader().load(self.rows)
+        expected = self.get_rows()
+        Test.objects.all().delete()
+
+        CopyLoader().load(self.rows)
+
+        self.assertEqual(self.get_rows(), expected)
+        self.assertEqual(len(expected[1]), 6)
+
+    def test_permanent_table_is_kept(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE TABLE import_questions (id integer)')
+            cursor.execute('INSERT INTO import_questions VALUES (1)')
+
+            CopyLoader().load(self.rows)
+            CopyLoader().load(self.rows)
+
+            cursor.execute('SELECT id FROM public.import_questions')
+            self.assertEqual(cursor.fetchall(), [(1,)])
@@ -0,0 +1,54 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class DuplicateOptionsMigrationTests(TransactionTestCase):
+    """0005 удаляет повторяющиеся номера вариантов перед ограничением."""
+
+    before = [('tests', '0004_question_content_hash')]
+    after = [('tests', '0005_hot_lookup_indexes')]
+
+    def setUp(self) -> None:
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate(self.before)
+
+    def tearDown(self) -> None:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_are_removed(self) -> None:
+        apps = self.executor.loader.project_state(self.before).apps
+        Test = apps.get_model('tests', 'Test')
+        Question = apps.get_model('tests', 'Question')
+        AnswerOption = apps.get_model('tests', 'AnswerOption')
+        question = Question.objects.create(
+            test=Test.objects.create(title='Тест'),
+            text='Вопрос',
+            question_type='single',
+        )
+        # Два набора вариантов у одного вопроса, как после прежнего импорта.
+        options = AnswerOption.objects.bulk_create(
+            AnswerOption(
+                question=question,
+                text=f'Вариант {text_set}-{number}',
+                number=number,
+                is_correct=number == text_set,
+            )
+            for text_set in range(2)
+            for number in range(3)
+        )
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+
+        apps = executor.loader.project_state(self.after).apps
+        AnswerOption = apps.get_model('tests', 'AnswerOption')
+        self.assertEqual(
+            list(
+                AnswerOption.objects.order_by('number').values_list(
+                    'id', 'number', 'is_correct'
+                )
+            ),
+            [(option.id, option.number, option.is_correct) for option in options[:3]],
+        )
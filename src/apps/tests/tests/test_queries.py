@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from apps.tests.models import Test, TestResult
+from apps.tests.tests.fixtures import create_test, create_user
+from apps.users.models import UserAnswer
+
+
+class QueryCountTests(APITestCase):
+    """Количество запросов не зависит от количества тестов и вопросов."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = create_user()
+
+    def test_list(self) -> None:
+        # Количество запросов не зависит и от количества тестов на странице.
+        for count in (1, 10):
+            Test.objects.all().delete()
+            for index in range(count):
+                create_test(f'Тест {index}', questions=3)
+            # Количество тестов и страница.
+            with self.assertNumQueries(2):
+                response = self.client.get('/tests/')
+            self.assertEqual(len(response.data['results']), count)
+            # Вопросы и варианты ответов добавляют по одному запросу.
+            with self.assertNumQueries(4):
+                response = self.client.get('/tests/', {'expand': 'questions'})
+            self.assertEqual(
+                [len(test['questions']) for test in response.data['results']],
+                [3] * count,
+            )
+
+    def test_retrieve(self) -> None:
+        for questions in (1, 10):
+            test = create_test(f'Тест {questions}', questions=questions)
+            with self.assertNumQueries(3):
+                self.client.get(f'/tests/{test.pk}/')
+            # Повторный запрос отдаётся из кэша.
+            with self.assertNumQueries(1):
+                self.client.get(f'/tests/{test.pk}/')
+
+    def test_user_test(self) -> None:
+        for questions in (1, 10):
+            test = create_test(f'Тест {questions}', questions=questions)
+            TestResult.objects.create(
+                user=self.user, test=test, total_questions=questions
+            )
+            UserAnswer.objects.bulk_create(
+                UserAnswer(user=self.user, question=question, selected_numbers=[0])
+                for question in test.questions.all()
+            )
+            # Тест, вопросы, варианты ответов, ответы и ключи ответов.
+            with self.assertNumQueries(5):
+                response = self.client.get(
+                    f'/tests/{test.pk}/user-test/', {'user_id': self.user.pk}
+                )
+            self.assertEqual(len(response.data['questions']), questions)
@@ -0,0 +1,182 @@
+import json
+from collections.abc import Callable, Iterator
+from typing import Any
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.tests import answer_writer, readers
+from apps.tests.answer_keys import AnswerKeyCache
+from apps.tests.loaders import load_selected_choices
+from apps.tests.models import AnswerOption, Question, Test, TestResult
+from apps.users.models import User, UserAnswer
+
+# Запросы, для которых строится план.
+EXPLAINED = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN в формате PostgreSQL')
+class QueryPlansTests(TestCase):
+    """Горячие запросы эндпоинтов используют индексы на заполненной БД.
+
+    Запросы собираются при вызове публичных функций и эндпоинтов, а их
+    планы строятся с enable_seqscan = off: последовательное сканирование
+    остаётся в плане, только если подходящего индекса нет.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        tests = Test.objects.bulk_create(
+            Test(title=f'Тест {index}') for index in range(20)
+        )
+        questions = Question.objects.bulk_create(
+            Question(test=test, text=f'Вопрос {index}', question_type='single')
+            for test in tests
+            for index in range(20)
+        )
+        AnswerOption.objects.bulk_create(
+            AnswerOption(
+                question=question,
+                text=f'Вариант {number}',
+                number=number,
+                is_correct=number == 0,
+            )
+            for question in questions
+            for number in range(4)
+        )
+        # Попыток на тест столько, что поиск попытки по одному test_id
+        # не дешевле unique_user_and_test даже после предыдущих тестов.
+        users = User.objects.bulk_create(
+            User(first_name='first_name', last_name='last_name') for _ in range(200)
+        )
+        TestResult.objects.bulk_create(
+            TestResult(user=user, test=test, total_questions=20)
+            for user in users[1:]
+            for test in tests[:2]
+        )
+        UserAnswer.objects.bulk_create(
+            UserAnswer(user=user, question=question, selected_numbers=[0])
+            for user in users[1:]
+            for question in questions[:40:2]
+        )
+        cls.user, cls.test, cls.question = users[1], tests[0], questions[1]
+        # Пользователь без попыток.
+        cls.new_user = users[0]
+
+    def setUp(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE tests_question, tests_answeroption')
+            cursor.execute('ANALYZE tests_testresult, users_useranswer')
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            constraints = connection.introspection.get_constraints(
+                cursor, Question._meta.db_table
+            )
+        self.test_index = next(
+            name
+            for name, constraint in constraints.items()
+            if constraint['index'] and constraint['columns'] == ['test_id']
+        )
+
+    def assertUsesIndexes(self, func: Callable, expected: set[str]) -> Any:
+        with CaptureQueriesContext(connection) as context:
+            result = func()
+        plans = [
+            self.explain(query['sql'])
+            for query in context.captured_queries
+            if query['sql'].lstrip().upper().startswith(EXPLAINED)
+        ]
+        seq_scans = {
+            node['Relation Name']
+            for plan in plans
+            for node in self.walk(plan)
+            if node['Node Type'] == 'Seq Scan'
+        }
+        indexes = {index for plan in plans for index in self.get_indexes(plan)}
+        self.assertEqual(seq_scans, set())
+        self.assertLessEqual(expected, indexes)
+        return result
+
+    @staticmethod
+    def explain(sql: str) -> dict:
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]['Plan']
+
+    @classmethod
+    def walk(cls, node: dict) -> Iterator[dict]:
+        yield node
+        for child in node.get('Plans', []):
+            yield from cls.walk(child)
+
+    @classmethod
+    def get_indexes(cls, plan: dict) -> Iterator[str]:
+        for node in cls.walk(plan):
+            if 'Index Name' in node:
+                yield node['Index Name']
+            # Индексы, по которым INSERT ... ON CONFLICT ищет конфликт.
+            yield from node.get('Conflict Arbiter Indexes', [])
+
+    def test_answer_keys(self) -> None:
+        self.assertUsesIndexes(
+            lambda: AnswerKeyCache(maxsize=10).get(self.question.pk),
+            {'tests_question_pkey', 'unique_question_and_number'},
+        )
+
+    def test_read_test(self) -> None:
+        self.assertUsesIndexes(
+            lambda: readers.read_test({'id': self.test.pk, 'title': self.test.title}),
+            {self.test_index, 'unique_question_and_number'},
+        )
+
+    def test_start_test(self) -> None:
+        response = self.assertUsesIndexes(
+            lambda: self.client.post(
+                '/tests/start-test/',
+                {'user_id': self.new_user.pk, 'test_id': self.test.pk},
+                content_type='application/json',
+            ),
+            {'unique_user_and_test', self.test_index},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_save_answer(self) -> None:
+        self.assertUsesIndexes(
+            lambda: answer_writer.save_answer(
+                {
+                    'user_id': self.user.pk,
+                    'question_id': self.question.pk,
+                    'numbers': [0],
+                }
+            ),
+            {
+                'unique_user_and_test',
+                'unique_user_and_question',
+                'tests_question_pkey',
+                'users_user_pkey',
+            },
+        )
+
+    def test_user_test(self) -> None:
+        self.assertUsesIndexes(
+            lambda: load_selected_choices(self.user.pk, self.test.pk),
+            {'unique_user_and_question'},
+        )
+
+    @override_settings(GRADING_MODE='deferred')
+    def test_end_test(self) -> None:
+        response = self.assertUsesIndexes(
+            lambda: self.client.post(
+                f'/tests/{self.test.pk}/end-test/?user_id={self.user.pk}'
+            ),
+            {
+                'unique_user_and_test',
+                'unique_user_and_question',
+                'unique_question_and_number',
+            },
+        )
+        self.assertEqual(response.status_code, 200)
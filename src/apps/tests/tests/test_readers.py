@@ -0,0 +1,92 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count
+from django.test import TestCase
+
+from apps.tests import readers
+from apps.tests.loaders import load_selected_choices
+from apps.tests.models import Test, TestResult
+from apps.tests.serializers.test import (
+    TestGETSerializer,
+    TestListGETSerializer,
+    TestResultGETSerializer,
+)
+from apps.tests.tests.fixtures import create_test, create_user, prefetch_questions
+from apps.users.models import UserAnswer
+
+
+class ReadersContractTests(TestCase):
+    """Ответы из строк .values() совпадают с ответами сериализаторов."""
+
+    def setUp(self) -> None:
+        self.tests = [
+            create_test('Первый тест', questions=4),
+            create_test('Второй тест', questions=2),
+            create_test('Пустой тест', questions=0),
+        ]
+        self.test = {'id': self.tests[0].pk, 'title': self.tests[0].title}
+        self.user = create_user()
+        TestResult.objects.create(user=self.user, test=self.tests[0], total_questions=4)
+        UserAnswer.objects.bulk_create(
+            UserAnswer(user=self.user, question=question, selected_numbers=[0, 2])
+            for question in self.tests[0].questions.order_by('id')[::2]
+        )
+
+    def assertSamePayload(self, expected, actual) -> None:
+        # Сравнение JSON учитывает и порядок ключей.
+        self.assertEqual(
+            json.dumps(expected, ensure_ascii=False),
+            json.dumps(actual, ensure_ascii=False),
+        )
+
+    def test_read_test(self) -> None:
+        self.assertSamePayload(
+            TestGETSerializer(
+                prefetch_questions(Test.objects).get(pk=self.test['id'])
+            ).data,
+            readers.read_test(self.test),
+        )
+
+    def test_read_user_test(self) -> None:
+        self.assertSamePayload(
+            TestResultGETSerializer(
+                prefetch_questions(Test.objects).get(pk=self.test['id']),
+                context={
+                    'selected_choices': load_selected_choices(
+                        self.user.pk, self.test['id']
+                    )
+                },
+            ).data,
+            readers.read_user_test(self.test, self.user.pk),
+        )
+
+    async def test_aread_user_test(self) -> None:
+        self.assertSamePayload(
+            await readers.aread_user_test(self.test, self.user.pk),
+            await sync_to_async(readers.read_user_test)(self.test, self.user.pk),
+        )
+
+    def test_read_test_list(self) -> None:
+        serialized = TestListGETSerializer(
+            prefetch_questions(Test.objects).annotate(
+                questions_count=Count('questions')
+            ),
+            many=True,
+        ).data
+        for fields in (
+            set(TestListGETSerializer.summary_fields),
+            {'id', 'title'},
+            {'id', 'questions'},
+            set(TestListGETSerializer.Meta.fields),
+        ):
+            with self.subTest(fields=fields):
+                self.assertSamePayload(
+                    [
+                        {key: value for key, value in test.items() if key in fields}
+                        for test in serialized
+                    ],
+                    readers.read_test_list(
+                        list(Test.objects.values_for_fields(fields)), fields
+                    ),
+                )
@@ -0,0 +1,86 @@
+import json
+from typing import Any
+
+from django.test import TestCase
+
+from apps.tests.models import TestResult
+from apps.tests.serializers.test import SaveAnswerTestSerializer
+from apps.tests.tests.fixtures import create_test, create_user
+from apps.users.models import UserAnswer
+
+# Тела запросов, которые не являются объектом.
+INVALID_BODIES = ([], [1], 1, 'x', None)
+
+# Некорректные значения первичного ключа.
+INVALID_PKS = (None, '', -1, 0, 'abc', '1.0', True, 2**70, [1], {'id': 1})
+
+# Некорректные значения поля numbers.
+INVALID_NUMBERS = (None, '', 'abc', '1.0', 1, [None], ['1.0', 'x'], [True], {})
+
+
+class SaveAnswerErrorsTests(TestCase):
+    """Ошибки быстрого пути save-answer совпадают с ошибками сериализатора."""
+
+    def setUp(self) -> None:
+        self.user = create_user()
+        self.test = create_test('Тест', questions=2)
+        self.question = self.test.questions.order_by('id').first()
+        TestResult.objects.create(user=self.user, test=self.test, total_questions=2)
+
+    def get_payload(self, **kwargs) -> dict[str, Any]:
+        return {
+            'user_id': self.user.pk,
+            'question_id': self.question.pk,
+            'numbers': [0],
+            **kwargs,
+        }
+
+    def get_serializer_errors(self, payload: Any) -> Any:
+        serializer = SaveAnswerTestSerializer(data=payload)
+        self.assertFalse(serializer.is_valid())
+        return json.loads(json.dumps(serializer.errors))
+
+    def assertSameErrors(self, payload: Any) -> None:
+        expected = self.get_serializer_errors(payload)
+        for url in ('/tests/save-answer/', '/async/tests/save-answer/'):
+            with self.subTest(url=url, payload=payload):
+                response = self.client.post(
+                    url, json.dumps(payload), content_type='application/json'
+                )
+                self.assertEqual(response.status_code, 400)
+                # Сравнение JSON учитывает и порядок ключей.
+                self.assertEqual(json.dumps(expected), json.dumps(response.json()))
+
+    def test_invalid_body(self) -> None:
+        for body in INVALID_BODIES:
+            self.assertSameErrors(body)
+
+    def test_invalid_pk(self) -> None:
+        for value in INVALID_PKS:
+            self.assertSameErrors(self.get_payload(user_id=value))
+            self.assertSameErrors(self.get_payload(question_id=value))
+            self.assertSameErrors(self.get_payload(user_id=value, question_id=value))
+
+    def test_invalid_numbers(self) -> None:
+        for value in INVALID_NUMBERS:
+            self.assertSameErrors(self.get_payload(numbers=value))
+            self.assertSameErrors(self.get_payload(user_id=-1, numbers=value))
+
+    def test_missing_fields(self) -> None:
+        self.assertSameErrors({})
+        for field in ('user_id', 'question_id', 'numbers'):
+            payload = self.get_payload()
+            del payload[field]
+            self.assertSameErrors(payload)
+
+    def test_validation(self) -> None:
+        # Номер варианта, которого нет у вопроса.
+        self.assertSameErrors(self.get_payload(numbers=[5]))
+        # Пользователь не начал тест.
+        self.assertSameErrors(self.get_payload(user_id=create_user().pk))
+
+    def test_duplicate(self) -> None:
+        UserAnswer.objects.create(
+            user=self.user, question=self.question, selected_numbers=[0]
+        )
+        self.assertSameErrors(self.get_payload())
@@ -0,0 +1,124 @@
+from django.db.transaction import atomic
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
+
+from apps.tests.models import TestResult
+from apps.tests.serializers.test import SaveAnswersTestSerializer
+from apps.tests.tests.fixtures import create_test, create_user
+from apps.users.models import UserAnswer
+
+UNIQUE_ERROR = (
+    'Поля user_id, question_id должны производить массив с уникальными значениями.'
+)
+
+
+class SaveAnswersTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = create_user()
+        self.test = create_test('Тест', questions=3)
+        self.questions = list(self.test.questions.order_by('id'))
+        TestResult.objects.create(user=self.user, test=self.test, total_questions=3)
+
+    def get_payload(self, answers: list[tuple[int, list[int]]]) -> dict:
+        return {
+            'user_id': self.user.pk,
+            'test_id': self.test.pk,
+            'answers': [
+                {'question_id': question_id, 'numbers': numbers}
+                for question_id, numbers in answers
+            ],
+        }
+
+    def post(self, answers: list[tuple[int, list[int]]]):
+        return self.client.post(
+            '/tests/save-answers/', self.get_payload(answers), format='json'
+        )
+
+    def assertNonFieldError(self, response, message: str) -> None:
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'non_field_errors': [message]})
+
+    def test_save_answers(self) -> None:
+        # У каждого вопроса верен только вариант 0, поэтому верен первый ответ.
+        response = self.post(
+            [
+                (self.questions[0].pk, [0]),
+                (self.questions[1].pk, [1, 0]),
+                (self.questions[2].pk, [2]),
+            ]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        answers = response.json()['answers']
+        self.assertEqual(
+            [answer['question_id'] for answer in answers],
+            [question.pk for question in self.questions],
+        )
+        options = [
+            list(
+                question.answer_options.order_by('number').values_list('id', flat=True)
+            )
+            for question in self.questions
+        ]
+        self.assertEqual(
+            [answer['selected_choices'] for answer in answers],
+            [[options[0][0]], [options[1][0], options[1][1]], [options[2][2]]],
+        )
+        self.assertEqual(
+            list(
+                UserAnswer.objects.order_by('question_id').values_list(
+                    'selected_numbers', flat=True
+                )
+            ),
+            [[0], [0, 1], [2]],
+        )
+        self.assertEqual(TestResult.objects.get().results, 1)
+
+    def test_duplicate_in_batch(self) -> None:
+        response = self.post([(self.questions[0].pk, [0]), (self.questions[0].pk, [1])])
+
+        self.assertNonFieldError(response, 'Повторяющиеся вопросы в ответах.')
+        self.assertFalse(UserAnswer.objects.exists())
+
+    def test_already_answered(self) -> None:
+        UserAnswer.objects.create(
+            user=self.user, question=self.questions[1], selected_numbers=[0]
+        )
+
+        response = self.post([(self.questions[0].pk, [0]), (self.questions[1].pk, [0])])
+
+        self.assertNonFieldError(response, UNIQUE_ERROR)
+        self.assertEqual(UserAnswer.objects.count(), 1)
+        self.assertEqual(TestResult.objects.get().results, 0)
+
+    def test_concurrent_batch(self) -> None:
+        serializer = SaveAnswersTestSerializer(
+            data=self.get_payload([(self.questions[0].pk, [0])])
+        )
+        self.assertTrue(serializer.is_valid())
+        # Параллельный запрос сохранил ответ после проверки.
+        UserAnswer.objects.create(
+            user=self.user, question=self.questions[0], selected_numbers=[1]
+        )
+
+        with self.assertRaises(ValidationError) as context, atomic():
+            serializer.save()
+
+        self.assertEqual(context.exception.detail, {'non_field_errors': [UNIQUE_ERROR]})
+        self.assertEqual(TestResult.objects.get().results, 0)
+
+    def test_foreign_question(self) -> None:
+        other = create_test('Другой тест', questions=1).questions.get()
+
+        response = self.post([(self.questions[0].pk, [0]), (other.pk, [0])])
+
+        self.assertNonFieldError(response, 'Вопрос не относится к этому тесту.')
+        self.assertFalse(UserAnswer.objects.exists())
+
+    def test_not_started(self) -> None:
+        TestResult.objects.all().delete()
+
+        response = self.post([(self.questions[0].pk, [0])])
+
+        self.assertNonFieldError(response, 'Пользователь не начал этот тест.')
+        self.assertFalse(UserAnswer.objects.exists())
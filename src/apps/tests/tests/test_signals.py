@@ -0,0 +1,23 @@
+from django.test import TestCase
+
+from apps.tests.models import Question, Test
+from apps.tests.tests.fixtures import create_test
+
+
+class TestVersionTests(TestCase):
+    def test_save_after_question_change(self) -> None:
+        test = create_test('Тест', questions=1)
+        stale = Test.objects.get(pk=test.pk)
+        version = stale.version
+
+        question = Question.objects.get(test=test)
+        question.text = 'Новый текст'
+        question.save()
+        stale.title = 'Новое название'
+        stale.save()
+
+        self.assertEqual(stale.version, version + 2)
+        self.assertEqual(Test.objects.get(pk=test.pk).version, version + 2)
+
+    def test_create(self) -> None:
+        self.assertEqual(Test.objects.create(title='Тест').version, 0)
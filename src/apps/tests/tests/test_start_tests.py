@@ -0,0 +1,100 @@
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from rest_framework.test import APITestCase
+
+from apps.tests.attempts import start_tests
+from apps.tests.models import ArchivedAttempt, TestResult
+from apps.tests.tests.fixtures import create_test, create_user
+
+
+class StartTestsTests(APITestCase):
+    def setUp(self) -> None:
+        self.test = create_test('Тест', questions=3)
+        self.users = [create_user() for _ in range(4)]
+        self.user_ids = [user.pk for user in self.users]
+
+    def post(self, user_ids: list[int]):
+        return self.client.post(
+            '/tests/start-tests/',
+            {'test_id': self.test.pk, 'user_ids': user_ids},
+            format='json',
+        )
+
+    def test_start_tests(self) -> None:
+        response = self.post(self.user_ids)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [attempt['user_id'] for attempt in response.data['attempts']],
+            self.user_ids,
+        )
+        self.assertEqual(
+            {attempt['total_questions'] for attempt in response.data['attempts']}, {3}
+        )
+        self.assertEqual(response.data['skipped'], [])
+        self.assertEqual(TestResult.objects.filter(test=self.test).count(), 4)
+
+    def test_skip_existing(self) -> None:
+        TestResult.objects.create(user=self.users[1], test=self.test, total_questions=3)
+
+        response = self.post(self.user_ids)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['skipped'], [self.users[1].pk])
+        self.assertEqual(len(response.data['attempts']), 3)
+        self.assertEqual(TestResult.objects.filter(test=self.test).count(), 4)
+
+    def test_skip_archived(self) -> None:
+        ArchivedAttempt.objects.create(
+            user=self.users[2], test=self.test, results=1, total_questions=3
+        )
+
+        response = self.post(self.user_ids)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['skipped'], [self.users[2].pk])
+        self.assertFalse(
+            TestResult.objects.filter(user=self.users[2], test=self.test).exists()
+        )
+
+    def test_duplicates(self) -> None:
+        response = self.post(self.user_ids[:2] * 2)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['attempts']), 2)
+        self.assertEqual(response.data['skipped'], [])
+        # Повторный вызов функции с повторами тоже не создаёт лишних попыток.
+        self.assertEqual(start_tests(self.test.pk, self.user_ids[:1] * 2), [])
+
+    def test_unknown_users(self) -> None:
+        missing = max(self.user_ids) + 1
+
+        response = self.post([self.user_ids[0], missing])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(missing), str(response.data['user_ids'][0]))
+        self.assertFalse(TestResult.objects.filter(test=self.test).exists())
+
+    def test_command(self) -> None:
+        TestResult.objects.create(user=self.users[0], test=self.test, total_questions=3)
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as file:
+            file.write('\n'.join(map(str, self.user_ids)))
+            file.flush()
+            stdout = StringIO()
+            call_command(
+                'start_tests', self.test.pk, file.name, batch_size=2, stdout=stdout
+            )
+
+        self.assertIn(
+            'Начато попыток: 3, пропущено пользователей: 1', stdout.getvalue()
+        )
+        self.assertEqual(TestResult.objects.filter(test=self.test).count(), 4)
+
+    def test_command_invalid_id(self) -> None:
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as file:
+            file.write('1\nabc\n')
+            file.flush()
+            with self.assertRaises(CommandError):
+                call_command('start_tests', self.test.pk, file.name)
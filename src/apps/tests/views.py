@@ -1,38 +1,57 @@
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import QuerySet
 from django.db.transaction import atomic
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
+from rest_framework.utils import html
 from rest_framework.viewsets import ModelViewSet
 
-from apps.tests.models import Test, TestResult
+from apps.tests import answer_writer, exports, grading, payload_cache, readers
+from apps.tests.answer_buffer import answer_buffer
+from apps.tests.models import ArchivedAttempt, Test, TestResult
 from apps.tests.serializers.test import (
     CompletionTestSerializer,
+    SaveAnswersTestSerializer,
     SaveAnswerTestSerializer,
     StartTestSerializer,
+    StartTestsSerializer,
     TestGETSerializer,
+    TestListGETSerializer,
     TestResultGETSerializer,
     TestSerializer,
 )
+from core.pagination import PaginationModeMixin
 
 
-class TestViewSet(ModelViewSet):
+class TestViewSet(PaginationModeMixin, ModelViewSet):
     """Эндпоинты сущности test."""
 
     queryset = Test.objects.all()
     serializer_class = TestGETSerializer
     serializer_action_classes = {
-        'list': TestGETSerializer,
+        'list': TestListGETSerializer,
         'retrieve': TestGETSerializer,
         'partial_update': TestSerializer,
         'destroy': TestSerializer,
         'create': TestSerializer,
         'update': TestSerializer,
         'start_test': StartTestSerializer,
+        'start_tests': StartTestsSerializer,
         'save_answer': SaveAnswerTestSerializer,
+        'save_answers': SaveAnswersTestSerializer,
         'user_test': TestResultGETSerializer,
         'end_test': CompletionTestSerializer,
     }
@@ -40,8 +59,70 @@ class TestViewSet(ModelViewSet):
     def get_serializer_class(self) -> Serializer:
         return self.serializer_action_classes.get(self.action)
 
+    def get_queryset(self) -> QuerySet:
+        if self.action == 'list':
+            return Test.objects.values_for_fields(self.get_list_fields())
+        return super().get_queryset()
+
+    def get_list_fields(self) -> set[str]:
+        """Поля списка тестов из параметров ?fields=id,title&expand=questions."""
+        fields = {
+            field
+            for field in self.request.query_params.get('fields', '').split(',')
+            if field
+        } or set(TestListGETSerializer.summary_fields)
+        fields |= set(self.request.query_params.get('expand', '').split(','))
+        return fields & set(TestListGETSerializer.Meta.fields)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='fields',
+                type=str,
+                description=(
+                    'Поля теста через запятую: id, title, questions_count. '
+                    'По умолчанию возвращаются все три.'
+                ),
+            ),
+            OpenApiParameter(
+                name='expand',
+                type=str,
+                description='Вложенные поля через запятую: questions.',
+            ),
+        ],
+    )
     def list(self, request: Request, *args, **kwargs) -> Response:
-        return super().list(request, *args, **kwargs)
+        fields = self.get_list_fields()
+        queryset = self.get_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(readers.read_test_list(page, fields))
+        return Response(readers.read_test_list(list(queryset), fields))
+
+    def retrieve(self, request: Request, *args, **kwargs) -> HttpResponse:
+        test = get_object_or_404(
+            Test.objects.values('id', 'title', 'version'), pk=kwargs['pk']
+        )
+        version = test.pop('version')
+        etag = payload_cache.get_etag(test['id'], version)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            key = payload_cache.get_cache_key(
+                test['id'], version, request.accepted_renderer.format
+            )
+            content = payload_cache.get_payload(key)
+            if content is None:
+                content = request.accepted_renderer.render(
+                    readers.read_test(test),
+                    request.accepted_media_type,
+                    self.get_renderer_context(),
+                )
+                payload_cache.set_payload(key, content)
+            response = HttpResponse(
+                content, content_type=request.accepted_renderer.media_type
+            )
+        response['ETag'] = etag
+        return response
 
     @extend_schema(request=StartTestSerializer, responses={200: StartTestSerializer})
     @action(
@@ -54,17 +135,65 @@ class TestViewSet(ModelViewSet):
         self.perform_create(serializer)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @extend_schema(request=StartTestsSerializer, responses={200: StartTestsSerializer})
+    @action(
+        methods=['post'], detail=False, url_path='start-tests', url_name='start-tests'
+    )
+    def start_tests(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
     @extend_schema(
-        request=SaveAnswerTestSerializer, responses={200: SaveAnswerTestSerializer}
+        request=SaveAnswerTestSerializer,
+        responses={200: SaveAnswerTestSerializer, 202: SaveAnswerTestSerializer},
     )
     @action(
         methods=['post'], detail=False, url_path='save-answer', url_name='save-answer'
     )
-    @atomic
     def save_answer(self, request: Request, *args, **kwargs) -> Response:
+        # JSON-объект сохраняется одним запросом, данные форм и тело другого
+        # типа — через сериализатор.
+        if (
+            not settings.ANSWER_BUFFER_ENABLED
+            and isinstance(request.data, dict)
+            and not html.is_html_input(request.data)
+        ):
+            return Response(
+                answer_writer.save_answer(request.data), status=status.HTTP_200_OK
+            )
+
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        if settings.ANSWER_BUFFER_ENABLED:
+            # Журнал дописывается вне транзакции: запись на диск не держит
+            # транзакцию и соединение с БД.
+            serializer.is_valid(raise_exception=True)
+            return Response(serializer.buffer(), status=status.HTTP_202_ACCEPTED)
+
+        with atomic():
+            serializer.is_valid(raise_exception=True)
+            self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=SaveAnswersTestSerializer, responses={200: SaveAnswersTestSerializer}
+    )
+    @action(
+        methods=['post'],
+        detail=False,
+        url_path='save-answers',
+        url_name='save-answers',
+    )
+    def save_answers(self, request: Request, *args, **kwargs) -> Response:
+        if settings.ANSWER_BUFFER_ENABLED:
+            answer_buffer.flush_attempt(
+                request.data.get('user_id'), request.data.get('test_id')
+            )
+        with atomic():
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @extend_schema(
@@ -80,10 +209,11 @@ class TestViewSet(ModelViewSet):
     )
     @action(methods=['get'], detail=True, url_path='user-test', url_name='user-test')
     def user_test(self, request: Request, *args, **kwargs) -> Response:
-        instance = self.get_object()
+        test = get_object_or_404(Test.objects.values('id', 'title'), pk=kwargs['pk'])
         user_id = request.query_params.get('user_id')
-        serializer = self.get_serializer(instance, context={'user_id': user_id})
-        return Response(serializer.data)
+        if settings.ANSWER_BUFFER_ENABLED:
+            answer_buffer.flush_attempt(user_id, test['id'])
+        return Response(readers.read_user_test(test, user_id))
 
     @extend_schema(
         request=None,
@@ -96,14 +226,78 @@ class TestViewSet(ModelViewSet):
         ],
     )
     @action(methods=['post'], detail=True, url_path='end-test', url_name='end-test')
-    @atomic
     def end_test(self, request: Request, *args, **kwargs) -> Response:
-        instance = TestResult.objects.filter(
-            test_id=kwargs['pk'], user_id=request.query_params.get('user_id')
-        ).first()
-        if instance.status is True:
-            raise ValidationError('Тест уже завершён!')
-        serializer = self.get_serializer(instance, data={'status': True}, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        user_id = request.query_params.get('user_id')
+        if settings.ANSWER_BUFFER_ENABLED:
+            # Ответы переносятся в отдельной транзакции до завершения теста.
+            answer_buffer.flush_attempt(user_id, kwargs['pk'])
+        with atomic():
+            instance = TestResult.objects.filter(
+                test_id=kwargs['pk'], user_id=user_id
+            ).first()
+            if instance is None:
+                if not ArchivedAttempt.objects.filter(
+                    test_id=kwargs['pk'], user_id=user_id
+                ).exists():
+                    raise Http404
+                raise ValidationError('Тест уже завершён!')
+            if instance.status is True:
+                raise ValidationError('Тест уже завершён!')
+            if grading.is_deferred():
+                instance.results = grading.count_correct_answers(user_id, kwargs['pk'])
+            serializer = self.get_serializer(
+                instance, data={'status': True}, partial=True
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save(finished_at=timezone.now())
         return Response(serializer.data)
+
+    @extend_schema(
+        request=None,
+        responses={
+            (200, 'text/csv'): OpenApiTypes.BINARY,
+            (200, 'application/vnd.apache.parquet'): OpenApiTypes.BINARY,
+        },
+        parameters=[
+            OpenApiParameter(
+                name='rows',
+                type=str,
+                enum=tuple(exports.COLUMNS),
+                description=(
+                    'attempts — строка на попытку, answers — строка на ответ. '
+                    'По умолчанию attempts.'
+                ),
+            ),
+            OpenApiParameter(
+                name='output',
+                type=str,
+                enum=tuple(exports.STREAMS),
+                description='Формат файла. По умолчанию csv.',
+            ),
+        ],
+    )
+    @action(methods=['get'], detail=True, url_path='export', url_name='export')
+    def export(self, request: Request, *args, **kwargs) -> StreamingHttpResponse:
+        test = get_object_or_404(Test.objects.values('id'), pk=kwargs['pk'])
+        rows = request.query_params.get('rows', 'attempts')
+        output = request.query_params.get('output', 'csv')
+        if rows not in exports.COLUMNS:
+            raise ValidationError({'rows': ['Допустимые значения: attempts, answers.']})
+        if output not in exports.STREAMS:
+            raise ValidationError({'output': ['Допустимые значения: csv, parquet.']})
+        if output == 'parquet' and find_spec('pyarrow') is None:
+            raise ValidationError({'output': ['Для Parquet требуется пакет pyarrow.']})
+
+        stream = (
+            exports.astream
+            if isinstance(request._request, ASGIRequest)
+            else exports.stream
+        )
+        response = StreamingHttpResponse(
+            stream(test['id'], rows, output),
+            content_type=exports.CONTENT_TYPES[output],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="test-{test["id"]}-{rows}.{output}"'
+        )
+        return response
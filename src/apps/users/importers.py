@@ -0,0 +1,79 @@
+from collections.abc import Iterator
+
+import pandas as pd
+from django.db import connection
+
+from apps.tests.importers import copy_rows
+from apps.users.models import User
+from apps.users.serializers.user import UserSerializer
+
+RESERVE_IDS_SQL = """
+SELECT nextval(pg_get_serial_sequence('{user_table}', 'id'))
+FROM generate_series(1, %s)
+ORDER BY 1
+"""
+
+
+def read_users(csv_file_path: str, chunk_size: int) -> Iterator[list[dict]]:
+    """Пользователи из CSV файла с колонками first_name, last_name частями."""
+    for frame in pd.read_csv(
+        csv_file_path,
+        dtype=str,
+        keep_default_na=False,
+        usecols=['first_name', 'last_name'],
+        chunksize=chunk_size,
+    ):
+        yield frame.to_dict('records')
+
+
+def validate_users(rows: list[dict]) -> list[dict]:
+    serializer = UserSerializer(data=rows, many=True)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def format_errors(errors: list[dict], offset: int = 0) -> str:
+    return '; '.join(
+        f'строка {offset + index + 1}, {field}: {" ".join(map(str, messages))}'
+        for index, row_errors in enumerate(errors)
+        for field, messages in row_errors.items()
+    )
+
+
+class OrmUserLoader:
+    """Создание пользователей через bulk_create, работает с любой БД."""
+
+    def load(self, rows: list[dict]) -> list[User]:
+        return User.objects.bulk_create(User(**row) for row in rows)
+
+
+class CopyUserLoader:
+    """Создание пользователей в PostgreSQL через COPY.
+
+    Идентификаторы заранее берутся из последовательности таблицы, поэтому
+    возвращаются в порядке строк, как и при bulk_create.
+    """
+
+    def load(self, rows: list[dict]) -> list[User]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                RESERVE_IDS_SQL.format(user_table=User._meta.db_table), [len(rows)]
+            )
+            users = [
+                User(id=user_id, **row)
+                for (user_id,), row in zip(cursor.fetchall(), rows)
+            ]
+            copy_rows(
+                cursor,
+                f'{User._meta.db_table} (id, first_name, last_name)',
+                ((user.id, user.first_name, user.last_name) for user in users),
+            )
+        return users
+
+
+def get_loader(backend: str) -> OrmUserLoader | CopyUserLoader:
+    if backend == 'auto':
+        backend = 'copy' if connection.vendor == 'postgresql' else 'orm'
+    if backend == 'copy':
+        return CopyUserLoader()
+    return OrmUserLoader()
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.transaction import atomic
+from rest_framework.exceptions import ValidationError
+
+from apps.users.importers import format_errors, get_loader, read_users, validate_users
+
+
+class Command(BaseCommand):
+    help = (
+        'Импорт пользователей из CSV файла с колонками first_name, last_name; '
+        'идентификаторы созданных пользователей выводятся в stdout по порядку'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', type=str, help='Путь к CSV файлу')
+        parser.add_argument(
+            '--backend',
+            choices=['auto', 'orm', 'copy'],
+            default='auto',
+            help=(
+                'Способ загрузки: copy — COPY (PostgreSQL), orm — bulk_create, '
+                'auto — copy для PostgreSQL, иначе orm'
+            ),
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество пользователей, проверяемых и сохраняемых за раз',
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs['backend'] == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError('COPY доступен только для PostgreSQL.')
+        loader = get_loader(kwargs['backend'])
+
+        imported = 0
+        started = time.perf_counter()
+        # Файл импортируется целиком или не импортируется вовсе.
+        with atomic():
+            for rows in read_users(kwargs['csv_file'], kwargs['batch_size']):
+                try:
+                    rows = validate_users(rows)
+                except ValidationError as exc:
+                    raise CommandError(format_errors(exc.detail, offset=imported))
+                for user in loader.load(rows):
+                    self.stdout.write(str(user.id))
+                imported += len(rows)
+
+        elapsed = time.perf_counter() - started
+        self.stderr.write(
+            f'Импортировано пользователей: {imported} ({imported / elapsed:.0f} в секунду)'
+        )
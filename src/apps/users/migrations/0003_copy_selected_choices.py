@@ -0,0 +1,35 @@
+from django.db import migrations
+
+COPY_SELECTED_CHOICES_SQL = """
+UPDATE users_useranswer ua
+SET selected_numbers = s.numbers
+FROM (
+    SELECT sc.useranswer_id, array_agg(ao.number ORDER BY ao.number) AS numbers
+    FROM users_useranswer_selected_choices sc
+    JOIN tests_answeroption ao ON ao.id = sc.answeroption_id
+    GROUP BY sc.useranswer_id
+) s
+WHERE ua.id = s.useranswer_id;
+"""
+
+RESTORE_SELECTED_CHOICES_SQL = """
+INSERT INTO users_useranswer_selected_choices (useranswer_id, answeroption_id)
+SELECT ua.id, ao.id
+FROM users_useranswer ua
+JOIN tests_answeroption ao
+    ON ao.question_id = ua.question_id AND ao.number = ANY(ua.selected_numbers);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0001_initial'),
+        ('users', '0002_useranswer_selected_numbers'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            COPY_SELECTED_CHOICES_SQL, reverse_sql=RESTORE_SELECTED_CHOICES_SQL
+        ),
+    ]
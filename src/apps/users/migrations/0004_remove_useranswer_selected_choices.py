@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:17
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_copy_selected_choices'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='useranswer',
+            name='selected_choices',
+        ),
+    ]
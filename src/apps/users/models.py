@@ -1,3 +1,4 @@
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
 
 
@@ -6,12 +7,25 @@ class User(models.Model):
     last_name = models.CharField(max_length=128)
 
 
+class UserAnswerQuerySet(models.QuerySet):
+    def upsert(self, user_answers: list['UserAnswer']) -> list['UserAnswer']:
+        """Сохраняет ответы, заменяя выбранные варианты уже сохранённых."""
+        return self.bulk_create(
+            user_answers,
+            update_conflicts=True,
+            unique_fields=['user', 'question'],
+            update_fields=['selected_numbers'],
+        )
+
+
 class UserAnswer(models.Model):
-    user = models.ForeignKey('users.User', on_delete=models.CASCADE)
+    # Поиск по пользователю обслуживает индекс unique_user_and_question.
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, db_index=False)
     question = models.ForeignKey('tests.Question', on_delete=models.CASCADE)
-    selected_choices = models.ManyToManyField(
-        'tests.AnswerOption', related_name='user_answers'
-    )
+    # Номера выбранных вариантов ответа (AnswerOption.number) по возрастанию.
+    selected_numbers = ArrayField(models.PositiveIntegerField(), default=list)
+
+    objects = UserAnswerQuerySet.as_manager()
 
     class Meta:
         constraints = (
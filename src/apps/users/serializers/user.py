@@ -1,5 +1,6 @@
+from django.conf import settings
 from drf_spectacular.utils import OpenApiExample, extend_schema_serializer
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import ModelSerializer, Serializer
 
 from apps.users.models import User
 
@@ -33,3 +34,33 @@ class UserSerializer(ModelSerializer):
             'first_name',
             'last_name',
         )
+
+
+@extend_schema_serializer(
+    examples=[
+        OpenApiExample(
+            'Valid example response',
+            value={
+                'users': [
+                    {'id': 1, 'first_name': 'first_name', 'last_name': 'last_name'},
+                    {'id': 2, 'first_name': 'first_name', 'last_name': 'last_name'},
+                ],
+            },
+            response_only=True,
+        ),
+        OpenApiExample(
+            name='Valid example request',
+            value={
+                'users': [
+                    {'first_name': 'first_name', 'last_name': 'last_name'},
+                    {'first_name': 'first_name', 'last_name': 'last_name'},
+                ],
+            },
+            request_only=True,
+        ),
+    ]
+)
+class UserBulkCreateSerializer(Serializer):
+    users = UserSerializer(
+        many=True, allow_empty=False, max_length=settings.USER_BULK_CREATE_MAX_SIZE
+    )
@@ -0,0 +1,131 @@
+import csv
+import tempfile
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from apps.users.importers import CopyUserLoader, OrmUserLoader
+from apps.users.models import User
+
+NAMES = [('Иван', 'Иванов'), ('Пётр', 'Петров'), ('Анна', 'Сидорова')]
+
+
+def get_rows(names: list[tuple[str, str]]) -> list[dict]:
+    return [
+        {'first_name': first_name, 'last_name': last_name}
+        for first_name, last_name in names
+    ]
+
+
+def get_users() -> list[tuple[int, str, str]]:
+    return list(
+        User.objects.order_by('id').values_list('id', 'first_name', 'last_name')
+    )
+
+
+class BulkCreateTests(APITestCase):
+    def post(self, rows: list[dict]):
+        return self.client.post('/users/bulk-create/', {'users': rows}, format='json')
+
+    def test_bulk_create(self) -> None:
+        response = self.post(get_rows(NAMES))
+
+        self.assertEqual(response.status_code, 201)
+        users = response.json()['users']
+        self.assertEqual(
+            [(user['first_name'], user['last_name']) for user in users], NAMES
+        )
+        self.assertEqual(
+            [(user['id'], user['first_name'], user['last_name']) for user in users],
+            get_users(),
+        )
+
+    def test_invalid_row(self) -> None:
+        rows = get_rows(NAMES)
+        rows[1]['last_name'] = 'ф' * 129
+
+        response = self.post(rows)
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['users']
+        self.assertEqual(
+            [bool(row_errors) for row_errors in errors], [False, True, False]
+        )
+        self.assertFalse(User.objects.exists())
+
+    def test_max_size(self) -> None:
+        rows = get_rows(NAMES[:1]) * (settings.USER_BULK_CREATE_MAX_SIZE + 1)
+
+        response = self.post(rows)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('users', response.json())
+        self.assertFalse(User.objects.exists())
+
+    def test_empty(self) -> None:
+        response = self.post([])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('users', response.json())
+
+
+class ImportUsersTests(TestCase):
+    def import_users(self, names: list[tuple[str, str]], *args: str) -> list[int]:
+        stdout = StringIO()
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as file:
+            writer = csv.writer(file)
+            writer.writerow(('first_name', 'last_name'))
+            writer.writerows(names)
+            file.flush()
+            call_command(
+                'import_users', file.name, *args, stdout=stdout, stderr=StringIO()
+            )
+        return [int(user_id) for user_id in stdout.getvalue().split()]
+
+    def test_import_users(self) -> None:
+        for backend in ('orm', 'copy'):
+            with self.subTest(backend=backend):
+                User.objects.all().delete()
+
+                ids = self.import_users(
+                    NAMES, '--backend', backend, '--batch-size', '2'
+                )
+
+                self.assertEqual(
+                    get_users(),
+                    [(user_id, *name) for user_id, name in zip(ids, NAMES)],
+                )
+
+    def test_invalid_row(self) -> None:
+        names = [*NAMES, ('', 'Без имени')]
+
+        with self.assertRaisesMessage(CommandError, 'строка 4, first_name'):
+            self.import_users(names, '--batch-size', '2')
+
+        # Уже сохранённая первая часть файла откатывается.
+        self.assertFalse(User.objects.exists())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'COPY доступен только для PostgreSQL')
+class CopyUserLoaderTests(TestCase):
+    def test_reserved_ids(self) -> None:
+        User.objects.bulk_create(User(**row) for row in get_rows(NAMES))
+        User.objects.all().delete()
+
+        users = CopyUserLoader().load(get_rows(NAMES))
+
+        # Идентификаторы идут после уже выданных и по порядку строк.
+        ids = [user.id for user in users]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(NAMES))
+        self.assertEqual(
+            get_users(), [(user.id, *name) for user, name in zip(users, NAMES)]
+        )
+        # Последовательность сдвинута, следующий пользователь получает новый id.
+        (user,) = OrmUserLoader().load(get_rows(NAMES[:1]))
+        self.assertGreater(user.id, ids[-1])
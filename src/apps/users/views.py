@@ -1,18 +1,23 @@
+from django.db.transaction import atomic
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 from rest_framework.viewsets import ModelViewSet
 
-from apps.tests.models import Test
-from apps.tests.serializers.test import TestGETSerializer
-from apps.users.serializers.user import UserSerializer
+from apps.users.importers import get_loader
+from apps.users.models import User
+from apps.users.serializers.user import UserBulkCreateSerializer, UserSerializer
+from core.pagination import PaginationModeMixin
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(PaginationModeMixin, ModelViewSet):
     """Эндпоинты сущности user."""
 
-    queryset = Test.objects.all()
-    serializer_class = TestGETSerializer
+    queryset = User.objects.all()
+    serializer_class = UserSerializer
     serializer_action_classes = {
         'list': UserSerializer,
         'retrieve': UserSerializer,
@@ -20,6 +25,7 @@ class UserViewSet(ModelViewSet):
         'destroy': UserSerializer,
         'create': UserSerializer,
         'update': UserSerializer,
+        'bulk_create': UserBulkCreateSerializer,
     }
 
     def get_serializer_class(self) -> Serializer:
@@ -27,3 +33,20 @@ class UserViewSet(ModelViewSet):
 
     def list(self, request: Request, *args, **kwargs) -> Response:
         return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        request=UserBulkCreateSerializer,
+        responses={201: UserBulkCreateSerializer},
+    )
+    @action(
+        methods=['post'], detail=False, url_path='bulk-create', url_name='bulk-create'
+    )
+    @atomic
+    def bulk_create(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Пользователи возвращаются в порядке запроса.
+        users = get_loader('auto').load(serializer.validated_data['users'])
+        return Response(
+            self.get_serializer({'users': users}).data, status=status.HTTP_201_CREATED
+        )
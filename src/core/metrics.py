@@ -0,0 +1,214 @@
+"""Метрики эндпоинтов в формате Prometheus (требуется пакет prometheus_client).
+
+Для каждого эндпоинта собираются время ответа, количество и время
+SQL-запросов и размер ответа, а при включённом пуле соединений — его
+загрузка. При запуске нескольких воркеров uvicorn
+нужно задать переменную окружения PROMETHEUS_MULTIPROC_DIR — общий
+каталог, через который значения воркеров суммируются в /metrics;
+загрузку пула отдаёт воркер, обработавший запрос /metrics.
+"""
+
+import os
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+LABELS = ('view', 'action', 'method')
+
+REQUESTS = Counter('http_requests', 'Количество запросов', [*LABELS, 'status'])
+REQUEST_DURATION = Histogram('http_request_duration_seconds', 'Время ответа', LABELS)
+DB_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Количество SQL-запросов за запрос',
+    LABELS,
+    buckets=(0, 1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 50, 100, 200),
+)
+DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', 'Время SQL-запросов за запрос', LABELS
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes',
+    'Размер тела ответа',
+    LABELS,
+    buckets=(100, 1000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+
+
+request_queries: ContextVar[QueryStats | None] = ContextVar(
+    'request_queries', default=None
+)
+
+
+def count_queries(execute, sql, params, many, context):
+    """execute_wrapper, учитывающий SQL-запросы текущего запроса."""
+    stats = request_queries.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+
+
+def install_query_counter(connection: BaseDatabaseWrapper, **kwargs) -> None:
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+connection_created.connect(install_query_counter)
+
+
+class PoolCollector(Collector):
+    """Загрузка пулов соединений psycopg 3 текущего процесса.
+
+    Статистика пула считывается при чтении /metrics, а не на каждом запросе.
+    При нескольких воркерах каждый отдаёт только свои пулы, поэтому серии
+    различаются меткой pid.
+    """
+
+    def collect(self) -> Iterator[Metric]:
+        pid = str(os.getpid())
+        pool_connections = GaugeMetricFamily(
+            'db_pool_connections',
+            'Соединения пула: max — размер пула, open — открытые, used — занятые',
+            labels=['alias', 'state', 'pid'],
+        )
+        waiting = GaugeMetricFamily(
+            'db_pool_requests_waiting',
+            'Запросы, ожидающие свободное соединение пула',
+            labels=['alias', 'pid'],
+        )
+        wait = CounterMetricFamily(
+            'db_pool_wait_seconds',
+            'Время ожидания соединения пула',
+            labels=['alias', 'pid'],
+        )
+        errors = CounterMetricFamily(
+            'db_pool_errors',
+            'Запросы соединения пула, завершившиеся ошибкой',
+            labels=['alias', 'pid'],
+        )
+        for alias in connections:
+            connection = connections[alias]
+            if not connection.settings_dict['OPTIONS'].get('pool'):
+                continue
+            stats = connection.pool.get_stats()
+            pool_connections.add_metric([alias, 'max', pid], stats['pool_max'])
+            pool_connections.add_metric([alias, 'open', pid], stats['pool_size'])
+            pool_connections.add_metric(
+                [alias, 'used', pid], stats['pool_size'] - stats['pool_available']
+            )
+            waiting.add_metric([alias, pid], stats['requests_waiting'])
+            wait.add_metric([alias, pid], stats.get('requests_wait_ms', 0) / 1000)
+            errors.add_metric([alias, pid], stats.get('requests_errors', 0))
+        yield from (pool_connections, waiting, wait, errors)
+
+
+POOL_COLLECTOR = PoolCollector()
+REGISTRY.register(POOL_COLLECTOR)
+
+
+def get_labels(request: HttpRequest) -> tuple[str, str, str]:
+    """Представление и действие DRF, обработавшие запрос."""
+    match = request.resolver_match
+    if match is None:
+        return 'unresolved', '', request.method
+    func = match.func
+    actions = getattr(func, 'actions', None)
+    if actions:
+        return (
+            func.cls.__name__,
+            actions.get(request.method.lower(), ''),
+            request.method,
+        )
+    view_class = getattr(func, 'cls', None) or getattr(func, 'view_class', None)
+    if view_class is not None:
+        return view_class.__name__, '', request.method
+    return func.__module__, func.__name__, request.method
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(connection)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        token = request_queries.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_queries.reset(token)
+        self.observe(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        stats = QueryStats()
+        token = request_queries.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_queries.reset(token)
+        self.observe(request, response, stats, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def observe(
+        request: HttpRequest,
+        response: HttpResponse,
+        stats: QueryStats,
+        duration: float,
+    ) -> None:
+        labels = get_labels(request)
+        REQUESTS.labels(*labels, response.status_code).inc()
+        REQUEST_DURATION.labels(*labels).observe(duration)
+        DB_QUERIES.labels(*labels).observe(stats.count)
+        DB_DURATION.labels(*labels).observe(stats.duration)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(POOL_COLLECTOR)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
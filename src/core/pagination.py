@@ -0,0 +1,50 @@
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация по первичному ключу без подсчёта общего количества.
+
+    Общее количество записей добавляется в ответ только при ?count=true.
+    """
+
+    ordering = 'id'
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ('true', '1'):
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            response = {'count': self.count, **response}
+        return Response(response)
+
+
+class PaginationModeMixin:
+    """Выбор пагинации параметром ?pagination=offset|cursor."""
+
+    pagination_query_param = 'pagination'
+    pagination_modes = {
+        'cursor': KeysetPagination,
+    }
+
+    @property
+    def paginator(self) -> BasePagination | None:
+        if not hasattr(self, '_paginator'):
+            mode = self.request.query_params.get(self.pagination_query_param)
+            pagination_class = self.pagination_modes.get(
+                mode, api_settings.DEFAULT_PAGINATION_CLASS
+            )
+            self._paginator = pagination_class()
+        return self._paginator
@@ -0,0 +1,33 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson.
+
+    Даты, Decimal и прочие типы, которые orjson не сериализует сам,
+    передаются в encoder_class DRF, поэтому их представление совпадает
+    с JSONRenderer. Ответы с отступами (indent в Accept) рендерит
+    JSONRenderer. В отличие от JSONRenderer, NaN и Infinity
+    сериализуются как null, а не приводят к ошибке.
+    """
+
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=self.options
+        )
+        # Как и JSONRenderer, экранируем U+2028 и U+2029 для совместимости с JavaScript.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+                b'\xe2\x80\xa9', b'\\u2029'
+            )
+        return ret
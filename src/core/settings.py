@@ -73,9 +73,23 @@ DATABASES = {
         'OPTIONS': {
             'options': '-c search_path=django,public'
         },
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', default=0)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Пул соединений psycopg 3 (требуются пакеты psycopg и psycopg-pool).
+# Пул несовместим с постоянными соединениями, поэтому CONN_MAX_AGE сбрасывается;
+# при CONN_HEALTH_CHECKS пул проверяет соединения перед выдачей.
+if bool(int(os.environ.get('DB_POOL', default=0))):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', default=2)),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', default=10)),
+        # Сколько секунд запрос ждёт свободное соединение, прежде чем упасть.
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', default=10)),
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -100,6 +114,20 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 100,
 }
 
+# Рендеринг и разбор JSON через orjson (требуется пакет orjson).
+if bool(int(os.environ.get('FAST_JSON', default=0))):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ('core.renderers.ORJSONRenderer',)
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    )
+
+# Метрики эндпоинтов для Prometheus на /metrics (требуется пакет prometheus_client).
+METRICS_ENABLED = bool(int(os.environ.get('METRICS_ENABLED', default=0)))
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'core.metrics.MetricsMiddleware')
+
 SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
     'COMPONENT_SPLIT_REQUEST': True,
@@ -115,6 +143,34 @@ SPECTACULAR_DEFAULTS = {
     },
 }
 
+ANSWER_KEY_CACHE_SIZE = int(os.environ.get('ANSWER_KEY_CACHE_SIZE', default=10000))
+
+TEST_PAYLOAD_CACHE_TIMEOUT = int(
+    os.environ.get('TEST_PAYLOAD_CACHE_TIMEOUT', default=60 * 60)
+)
+
+# Подсчёт баллов: immediate — при сохранении каждого ответа, deferred — одним
+# запросом при завершении теста (см. apps/tests/grading.py).
+GRADING_MODE = os.environ.get('GRADING_MODE', default='immediate')
+
+# Отложенная запись ответов save-answer: ответы дописываются в журналы
+# в ANSWER_BUFFER_DIR и переносятся в БД пачками (см. apps/tests/answer_buffer.py).
+ANSWER_BUFFER_ENABLED = bool(int(os.environ.get('ANSWER_BUFFER_ENABLED', default=0)))
+ANSWER_BUFFER_DIR = os.environ.get('ANSWER_BUFFER_DIR', default=BASE_DIR / 'answers')
+ANSWER_BUFFER_FSYNC = bool(int(os.environ.get('ANSWER_BUFFER_FSYNC', default=1)))
+ANSWER_BUFFER_BATCH_SIZE = int(os.environ.get('ANSWER_BUFFER_BATCH_SIZE', default=500))
+
+# Размер пачки строк серверного курсора при выгрузке результатов.
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', default=2000))
+
+# Наибольшее количество пользователей в одном запросе users/bulk-create.
+USER_BULK_CREATE_MAX_SIZE = int(
+    os.environ.get('USER_BULK_CREATE_MAX_SIZE', default=10000)
+)
+
+# Наибольшее количество пользователей в одном запросе tests/start-tests.
+START_TESTS_MAX_SIZE = int(os.environ.get('START_TESTS_MAX_SIZE', default=10000))
+
 DJANGO_ADMIN_USERNAME = os.environ.get('DJANGO_ADMIN_USERNAME')
 DJANGO_ADMIN_PASSWORD = os.environ.get('DJANGO_ADMIN_PASSWORD')
 
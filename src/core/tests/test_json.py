@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from io import BytesIO
+from unittest import skipUnless
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    from core.parsers import ORJSONParser
+    from core.renderers import ORJSONRenderer
+except ImportError:
+    ORJSONParser = ORJSONRenderer = None
+
+DATA = {
+    'decimal': Decimal('12.50'),
+    'datetime': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    'local': datetime(2024, 5, 1, 12, 30, tzinfo=timezone(timedelta(hours=3))),
+    'separators': 'строка\u2028абзац\u2029',
+    'text': 'Столица Франции?',
+    'items': [1, 2.5, None, True, {'вложенный': 'ключ'}],
+}
+
+
+@skipUnless(ORJSONRenderer, 'Требуется пакет orjson')
+class ORJSONRendererTests(SimpleTestCase):
+    def assertSameOutput(self, data, accepted_media_type=None) -> None:
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_same_output(self) -> None:
+        for key, value in DATA.items():
+            with self.subTest(key=key):
+                self.assertSameOutput({key: value})
+        self.assertSameOutput(DATA)
+        self.assertSameOutput(None)
+
+    def test_indent(self) -> None:
+        self.assertSameOutput(DATA, 'application/json; indent=4')
+        self.assertIn(
+            b'\n    ', ORJSONRenderer().render(DATA, 'application/json; indent=4')
+        )
+
+
+@skipUnless(ORJSONParser, 'Требуется пакет orjson')
+class ORJSONParserTests(SimpleTestCase):
+    def parse(self, body: bytes):
+        return ORJSONParser().parse(BytesIO(body))
+
+    def test_parse(self) -> None:
+        body = JSONRenderer().render(DATA)
+
+        self.assertEqual(self.parse(body), JSONParser().parse(BytesIO(body)))
+
+    def test_malformed(self) -> None:
+        for body in (b'{"user_id": 1,', b'', b'{"user_id": NaN}'):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    self.parse(body)
+
+    def test_not_utf8(self) -> None:
+        for body in ('{"text": "Тест"}'.encode('cp1251'), b'{"text": "\xff"}'):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    self.parse(body)
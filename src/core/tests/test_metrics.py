@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.tests.tests.fixtures import create_test
+
+try:
+    from prometheus_client import REGISTRY, generate_latest
+
+    from core import metrics
+except ImportError:
+    metrics = None
+
+SERIES = (
+    'http_request_duration_seconds_count',
+    'http_request_db_queries_count',
+    'http_request_db_queries_sum',
+    'http_response_size_bytes_count',
+    'http_response_size_bytes_sum',
+)
+
+
+@skipUnless(metrics, 'Требуется пакет prometheus_client')
+@override_settings(MIDDLEWARE=['core.metrics.MetricsMiddleware', *settings.MIDDLEWARE])
+class MetricsMiddlewareTests(APITestCase):
+    def setUp(self) -> None:
+        self.test = create_test('Тест')
+
+    def get_samples(self, labels: tuple[str, str, str]) -> dict[str, float]:
+        labels = dict(zip(metrics.LABELS, labels))
+        return {name: REGISTRY.get_sample_value(name, labels) or 0 for name in SERIES}
+
+    def assertObserved(self, before: dict, after: dict, response) -> None:
+        self.assertEqual(response.status_code, 200)
+        for name in SERIES:
+            if name.endswith('_count'):
+                self.assertEqual(after[name], before[name] + 1, name)
+        self.assertGreaterEqual(
+            after['http_request_db_queries_sum'],
+            before['http_request_db_queries_sum'] + 1,
+        )
+        self.assertEqual(
+            after['http_response_size_bytes_sum'],
+            before['http_response_size_bytes_sum'] + len(response.content),
+        )
+
+    def test_sync_view(self) -> None:
+        labels = ('TestViewSet', 'retrieve', 'GET')
+        before = self.get_samples(labels)
+
+        response = self.client.get(f'/tests/{self.test.pk}/')
+
+        self.assertObserved(before, self.get_samples(labels), response)
+
+    def test_pools_not_collected_per_request(self) -> None:
+        with mock.patch.object(metrics.PoolCollector, 'collect') as collect:
+            self.client.get(f'/tests/{self.test.pk}/')
+
+        collect.assert_not_called()
+
+    async def test_async_view(self) -> None:
+        labels = ('apps.tests.async_views', 'retrieve', 'GET')
+        before = self.get_samples(labels)
+
+        response = await self.async_client.get(f'/async/tests/{self.test.pk}/')
+
+        self.assertObserved(before, self.get_samples(labels), response)
+
+
+@skipUnless(metrics, 'Требуется пакет prometheus_client')
+class PoolCollectorTests(APITestCase):
+    def setUp(self) -> None:
+        self.pool = mock.Mock()
+        self.pool.get_stats.return_value = {
+            'pool_max': 10,
+            'pool_size': 4,
+            'pool_available': 1,
+            'requests_waiting': 2,
+            'requests_wait_ms': 1500,
+        }
+        connection = SimpleNamespace(
+            settings_dict={'OPTIONS': {'pool': True}}, pool=self.pool
+        )
+        patcher = mock.patch.object(metrics, 'connections', {'default': connection})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_collect(self) -> None:
+        samples = {
+            (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+            for family in metrics.POOL_COLLECTOR.collect()
+            for sample in family.samples
+        }
+        pid = str(metrics.os.getpid())
+
+        self.assertEqual(
+            samples,
+            {
+                (
+                    'db_pool_connections',
+                    (('alias', 'default'), ('pid', pid), ('state', state)),
+                ): value
+                for state, value in (('max', 10), ('open', 4), ('used', 3))
+            }
+            | {
+                ('db_pool_requests_waiting', (('alias', 'default'), ('pid', pid))): 2,
+                (
+                    'db_pool_wait_seconds_total',
+                    (('alias', 'default'), ('pid', pid)),
+                ): 1.5,
+                ('db_pool_errors_total', (('alias', 'default'), ('pid', pid))): 0,
+            },
+        )
+        self.assertIn(b'db_pool_connections{', generate_latest(REGISTRY))
@@ -0,0 +1,79 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from apps.users.models import User
+
+
+class PaginationTests(APITestCase):
+    def setUp(self) -> None:
+        self.ids = [
+            user.pk
+            for user in User.objects.bulk_create(
+                User(first_name=f'Имя {index}', last_name='Фамилия')
+                for index in range(5)
+            )
+        ]
+
+    def get(self, url: str) -> dict:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def get_ids(self, page: dict) -> list[int]:
+        return [user['id'] for user in page['results']]
+
+    def test_cursor_links(self) -> None:
+        first = self.get('/users/?pagination=cursor&limit=2')
+        self.assertEqual(self.get_ids(first), self.ids[:2])
+        self.assertIsNone(first['previous'])
+        self.assertIn('pagination=cursor', first['next'])
+
+        second = self.get(first['next'])
+        self.assertEqual(self.get_ids(second), self.ids[2:4])
+        self.assertIn('pagination=cursor', second['previous'])
+
+        last = self.get(second['next'])
+        self.assertEqual(self.get_ids(last), self.ids[4:])
+        self.assertIsNone(last['next'])
+
+        previous = self.get(second['previous'])
+        self.assertEqual(self.get_ids(previous), self.ids[:2])
+        self.assertNotIn('count', previous)
+
+    def test_count(self) -> None:
+        for url, count in (
+            ('/users/?pagination=cursor&limit=2', None),
+            ('/users/?pagination=cursor&limit=2&count=true', 5),
+        ):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    page = self.get(url)
+
+                self.assertEqual(page.get('count'), count)
+                self.assertEqual(self.get_ids(page), self.ids[:2])
+                count_queries = [
+                    query['sql']
+                    for query in queries.captured_queries
+                    if 'COUNT(*)' in query['sql']
+                ]
+                self.assertEqual(len(count_queries), int(count is not None))
+                self.assertEqual(len(queries), 1 + len(count_queries))
+
+        # Ссылка на следующую страницу сохраняет подсчёт.
+        page = self.get('/users/?pagination=cursor&limit=2&count=true')
+        self.assertEqual(self.get(page['next'])['count'], 5)
+
+    def test_default_limit_offset(self) -> None:
+        for url in (
+            '/users/?limit=2&offset=2',
+            '/users/?pagination=offset&limit=2&offset=2',
+        ):
+            with self.subTest(url=url):
+                page = self.get(url)
+
+                self.assertEqual(list(page), ['count', 'next', 'previous', 'results'])
+                self.assertEqual(page['count'], 5)
+                self.assertEqual(len(page['results']), 2)
+                self.assertIn('offset=4', page['next'])
+                self.assertIn('limit=2', page['previous'])
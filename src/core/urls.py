@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
@@ -6,6 +7,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('apps.tests.urls', namespace='tests')),
     path('', include('apps.users.urls', namespace='users')),
+    path('async/', include('apps.tests.async_urls', namespace='tests-async')),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path(
         'api/schema/swagger-ui/',
@@ -13,3 +15,8 @@ urlpatterns = [
         name='swagger-ui',
     ),
 ]
+
+if settings.METRICS_ENABLED:
+    from core.metrics import metrics
+
+    urlpatterns.append(path('metrics', metrics, name='metrics'))